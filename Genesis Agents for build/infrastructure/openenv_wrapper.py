@@ -10,17 +10,34 @@ Reference: Meta PyTorch OpenEnv framework
 Integration: 50-70% reliability improvement on external integrations
 """
 
+import ipaddress
 import json
 import logging
 import asyncio
 import os
-from typing import Dict, Any, List, Optional, Tuple, Callable
+import re
+import time
+from collections import deque
+from urllib.parse import urlparse
+from typing import Dict, Any, Deque, List, Optional, Tuple, Callable
 from dataclasses import dataclass
 from enum import Enum
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
+# Cloud metadata endpoints that must never be reachable from PlaywrightEnv
+_METADATA_HOSTS = frozenset({
+    "169.254.169.254",
+    "metadata.google.internal",
+    "metadata",
+})
+
+
+def _iso_timestamp(ts: float) -> str:
+    """Format a time.time() float as ISO-8601 (done lazily, only when history is read)"""
+    return datetime.fromtimestamp(ts).isoformat()
+
 
 class EnvironmentState(Enum):
     """Environment execution state"""
@@ -153,6 +170,21 @@ class PlaywrightEnv(OpenEnv):
         # Add production domains as needed
     ]
 
+    # Bounded action history (ring buffer) to keep long episodes O(1) in memory
+    HISTORY_MAXLEN = 1024
+
+    # Resolved lazily on first reset() so the module imports without Playwright
+    _async_playwright: Optional[Callable[[], Any]] = None
+
+    # Per-action reward on success (unknown actions get -0.5)
+    _ACTION_REWARDS: Dict[str, float] = {
+        "goto": 1.0,
+        "click": 1.0,
+        "type": 1.0,
+        "screenshot": 0.5,
+        "wait": 0.0,
+    }
+
     def __init__(self, goal: Optional[str] = None, headless: bool = True):
         """
         Initialize Playwright environment.
@@ -166,16 +198,57 @@ class PlaywrightEnv(OpenEnv):
         self.page = None
         self.goal = goal
         self.headless = headless
-        self.action_history: List[Dict] = []
+        # Entries: (timestamp, action, success, result, error)
+        self.action_history: Deque[Tuple[float, Dict[str, Any], bool, Optional[str], Optional[str]]] = deque(
+            maxlen=self.HISTORY_MAXLEN
+        )
         self.playwright_context = None
+        self._playwright = None
+        self.browser_context = None
+
+        # Action type -> coroutine returning a result description
+        self._handlers: Dict[str, Callable[[Dict[str, Any]], Any]] = {
+            "goto": self._do_goto,
+            "click": self._do_click,
+            "type": self._do_type,
+            "screenshot": self._do_screenshot,
+            "wait": self._do_wait,
+        }
 
         # Load allowed domains from environment (comma-separated)
         env_domains = os.getenv("PLAYWRIGHT_ALLOWED_DOMAINS", "").split(",")
         if env_domains and env_domains[0]:
             self.ALLOWED_DOMAINS.extend([d.strip() for d in env_domains if d.strip()])
 
+        # Precomputed whitelist for O(1) exact-host and C-level subdomain checks
+        self._allowed_exact = frozenset(d.lower() for d in self.ALLOWED_DOMAINS)
+        self._allowed_suffixes = tuple('.' + d for d in self._allowed_exact)
+
         logger.info(f"PlaywrightEnv initialized: goal={goal}, headless={headless}")
 
+    @property
+    def goal(self) -> Optional[str]:
+        return self._goal
+
+    @goal.setter
+    def goal(self, value: Optional[str]) -> None:
+        self._goal = value
+        self._precompute_goal()
+
+    def _precompute_goal(self) -> None:
+        """Cache lowercase goal, URL tokens and keyword flags used by _check_goal_reached"""
+        goal_lower = self._goal.lower() if self._goal else ""
+        self._goal_lower = goal_lower
+        self._goal_tokens = [word for word in goal_lower.split() if len(word) > 4]  # Skip short words
+        self._goal_has_dashboard = "dashboard" in goal_lower
+        self._goal_has_login = "login" in goal_lower
+        self._goal_has_navigate = "navigate" in goal_lower
+        # Single alternation regex: one C-level pass over the URL instead of N substring scans
+        self._goal_token_re = (
+            re.compile("|".join(re.escape(word) for word in self._goal_tokens))
+            if self._goal_has_navigate and self._goal_tokens else None
+        )
+
     def _validate_url(self, url: str) -> bool:
         """
         CRITICAL FIX: Validate URL against whitelist to prevent SSRF attacks.
@@ -194,9 +267,6 @@ class PlaywrightEnv(OpenEnv):
         Raises:
             ValueError: If URL is blocked for security reasons
         """
-        from urllib.parse import urlparse
-        import ipaddress
-
         try:
             parsed = urlparse(url)
             hostname = parsed.hostname
@@ -214,21 +284,21 @@ class PlaywrightEnv(OpenEnv):
 
             # Check if hostname is in allowed domains (exact match or subdomain)
             hostname_lower = hostname.lower()
-            if any(hostname_lower == allowed or hostname_lower.endswith('.' + allowed)
-                   for allowed in self.ALLOWED_DOMAINS):
+            if hostname_lower in self._allowed_exact or hostname_lower.endswith(self._allowed_suffixes):
                 return True
 
-            # Block private IP ranges
-            try:
-                ip = ipaddress.ip_address(hostname)
-                if ip.is_private or ip.is_loopback or ip.is_link_local:
-                    raise ValueError(f"Blocked private/internal IP: {hostname}")
-            except ValueError:
-                # Not an IP address, check if it's a domain
-                pass
+            # Block private IP ranges (only literal IPv4/IPv6 hosts need parsing)
+            if hostname_lower[0].isdigit() or ':' in hostname_lower:
+                try:
+                    ip = ipaddress.ip_address(hostname)
+                    if ip.is_private or ip.is_loopback or ip.is_link_local:
+                        raise ValueError(f"Blocked private/internal IP: {hostname}")
+                except ValueError:
+                    # Not an IP address, check if it's a domain
+                    pass
 
             # Block cloud metadata endpoints
-            if hostname_lower in ["169.254.169.254", "metadata.google.internal", "169.254.169.254"]:
+            if hostname_lower in _METADATA_HOSTS:
                 raise ValueError(f"Blocked cloud metadata endpoint: {hostname}")
 
             # If not in whitelist, block it
@@ -241,26 +311,72 @@ class PlaywrightEnv(OpenEnv):
             logger.error(f"URL validation failed for {url}: {e}")
             raise
 
-    async def reset(self) -> EnvObservation:
-        """Launch browser and navigate to start page"""
-        try:
+    def validate_urls(self, urls: List[str]) -> List[bool]:
+        """
+        Batch-check URLs against the whitelist without raising or logging per URL.
+
+        Applies the same allow rules as _validate_url (http/https scheme, whitelisted
+        host or subdomain) using the precomputed host set and suffix tuple, so large
+        batches (e.g. crawler schedules) avoid per-URL exception handling.
+
+        Args:
+            urls: URLs to validate
+
+        Returns:
+            List of booleans, True where the URL is allowed
+        """
+        allowed_exact = self._allowed_exact
+        allowed_suffixes = self._allowed_suffixes
+        results: List[bool] = []
+        for url in urls:
+            try:
+                parsed = urlparse(url)
+                hostname = parsed.hostname  # Already lowercased by urlparse
+            except ValueError:
+                results.append(False)
+                continue
+            results.append(
+                bool(hostname)
+                and parsed.scheme in ("http", "https")
+                and (hostname in allowed_exact or hostname.endswith(allowed_suffixes))
+            )
+        return results
+
+    @classmethod
+    def _load_async_playwright(cls) -> Callable[[], Any]:
+        """Import async_playwright once and cache it on the class"""
+        if cls._async_playwright is None:
             from playwright.async_api import async_playwright
+            cls._async_playwright = async_playwright
+        return cls._async_playwright
 
-            # Close existing browser if any
-            if self.browser:
-                await self.browser.close()
-                if self.playwright_context:
-                    await self.playwright_context.__aexit__(None, None, None)
+    async def _ensure_browser(self) -> None:
+        """Launch Playwright and Chromium once; reused by every reset()"""
+        if self.browser and self.browser.is_connected():
+            return
 
-            # Launch new browser
+        async_playwright = self._load_async_playwright()
+        if self.playwright_context is None:
             self.playwright_context = async_playwright()
-            playwright = await self.playwright_context.__aenter__()
-            self.browser = await playwright.chromium.launch(headless=self.headless)
-            self.page = await self.browser.new_page()
+            self._playwright = await self.playwright_context.__aenter__()
+        self.browser = await self._playwright.chromium.launch(headless=self.headless)
+        self.browser_context = None
+
+    async def reset(self) -> EnvObservation:
+        """Open a fresh page for a new episode (browser is launched only once)"""
+        try:
+            # Keep Chromium alive across episodes; only the context/page is recreated
+            await self._ensure_browser()
+
+            # Fresh isolated context per episode (cookies/storage don't leak)
+            if self.browser_context:
+                await self.browser_context.close()
+            self.browser_context = await self.browser.new_context()
+            self.page = await self.browser_context.new_page()
 
             self.episode_steps = 0
             self.episode_reward = 0.0
-            self.action_history = []
+            self.action_history.clear()
             self.state = EnvironmentState.READY
 
             logger.info("PlaywrightEnv reset successful")
@@ -301,53 +417,17 @@ class PlaywrightEnv(OpenEnv):
         action_type = action.get("type")
 
         try:
-            if action_type == "goto":
-                # CRITICAL FIX: Validate URL before navigation (SSRF prevention)
-                url = action["url"]
-                if not self._validate_url(url):
-                    raise ValueError(f"URL validation failed: {url}")
-                
-                await self.page.goto(url, timeout=10000)
-                reward = 1.0
+            handler = self._handlers.get(action_type)
+            if handler is not None:
+                result = await handler(action)
                 success = True
-                result = f"Navigated to {url}"
-
-            elif action_type == "click":
-                await self.page.click(action["selector"], timeout=5000)
-                reward = 1.0
-                success = True
-                result = f"Clicked {action['selector']}"
-
-            elif action_type == "type":
-                await self.page.fill(action["selector"], action["text"], timeout=5000)
-                reward = 1.0
-                success = True
-                result = f"Typed into {action['selector']}"
-
-            elif action_type == "screenshot":
-                screenshot_bytes = await self.page.screenshot()
-                reward = 0.5
-                success = True
-                result = f"Screenshot captured ({len(screenshot_bytes)} bytes)"
-
-            elif action_type == "wait":
-                await asyncio.sleep(action.get("ms", 1000) / 1000)
-                reward = 0.0
-                success = True
-                result = f"Waited {action.get('ms', 1000)}ms"
-
             else:
-                reward = -0.5
                 success = False
                 result = f"Unknown action: {action_type}"
+            reward = self._ACTION_REWARDS.get(action_type, -0.5)
 
-            # Track action history
-            self.action_history.append({
-                **action,
-                "success": success,
-                "result": result,
-                "timestamp": datetime.now().isoformat()
-            })
+            # Track action history (a copy, so later caller edits don't rewrite it)
+            self.action_history.append((time.time(), dict(action), success, result, None))
 
             self.episode_reward += reward
 
@@ -356,11 +436,18 @@ class PlaywrightEnv(OpenEnv):
             if done:
                 reward += 5.0  # Bonus for reaching goal
                 logger.info(f"PlaywrightEnv: Goal reached! Total reward: {self.episode_reward + 5.0}")
+            episode_done = done or self._is_terminal()
+
+            # Full page state only for observation/terminal steps; URL-only otherwise
+            if episode_done or action_type == "screenshot":
+                state = await self._get_state()
+            else:
+                state = self._get_state_lite()
 
             return EnvObservation(
-                state=await self._get_state(),
+                state=state,
                 reward=reward,
-                done=done or self._is_terminal(),
+                done=episode_done,
                 info={
                     "action": action_type,
                     "success": success,
@@ -374,15 +461,10 @@ class PlaywrightEnv(OpenEnv):
             logger.warning(f"Playwright action failed: {action_type}, error: {e}")
 
             # Track failure in history
-            self.action_history.append({
-                **action,
-                "success": False,
-                "error": str(e),
-                "timestamp": datetime.now().isoformat()
-            })
+            self.action_history.append((time.time(), dict(action), False, None, str(e)))
 
             return EnvObservation(
-                state=await self._get_state(),
+                state=self._get_state_lite(),
                 reward=-0.5,  # Negative reward for learning
                 done=False,
                 info={
@@ -393,6 +475,56 @@ class PlaywrightEnv(OpenEnv):
                 }
             )
 
+    async def _do_goto(self, action: Dict[str, Any]) -> str:
+        # CRITICAL FIX: Validate URL before navigation (SSRF prevention)
+        url = action["url"]
+        if not self._validate_url(url):
+            raise ValueError(f"URL validation failed: {url}")
+
+        await self.page.goto(url, timeout=10000)
+        return f"Navigated to {url}"
+
+    async def _do_click(self, action: Dict[str, Any]) -> str:
+        await self.page.click(action["selector"], timeout=5000)
+        return f"Clicked {action['selector']}"
+
+    async def _do_type(self, action: Dict[str, Any]) -> str:
+        await self.page.fill(action["selector"], action["text"], timeout=5000)
+        return f"Typed into {action['selector']}"
+
+    async def _do_screenshot(self, action: Dict[str, Any]) -> str:
+        screenshot_bytes = await self.page.screenshot()
+        return f"Screenshot captured ({len(screenshot_bytes)} bytes)"
+
+    async def _do_wait(self, action: Dict[str, Any]) -> str:
+        ms = action.get("ms", 1000)
+        await asyncio.sleep(ms / 1000)
+        return f"Waited {ms}ms"
+
+    def history_as_dicts(self) -> List[Dict[str, Any]]:
+        """Materialize action history as dicts, formatting timestamps on demand"""
+        history = []
+        for ts, action, success, result, error in self.action_history:
+            entry = {**action, "success": success}
+            if error is None:
+                entry["result"] = result
+            else:
+                entry["error"] = error
+            entry["timestamp"] = _iso_timestamp(ts)
+            history.append(entry)
+        return history
+
+    def _get_state_lite(self) -> Dict[str, Any]:
+        """Get lightweight state (URL only) without any browser round-trip"""
+        if not self.page:
+            return {"episode_steps": self.episode_steps}
+
+        return {
+            "url": self.page.url,
+            "episode_steps": self.episode_steps,
+            "action_count": len(self.action_history)
+        }
+
     async def _get_state(self) -> Dict[str, Any]:
         """Get observable state (URL, title, HTML snippet)"""
         if not self.page:
@@ -401,12 +533,15 @@ class PlaywrightEnv(OpenEnv):
         try:
             url = self.page.url
             title = await self.page.title()
-            html_content = await self.page.content()
+            # Truncate in the browser so only the snippet crosses the CDP bridge
+            html_snippet = await self.page.evaluate(
+                "() => document.documentElement.outerHTML.slice(0, 500)"
+            )
 
             return {
                 "url": url,
                 "title": title,
-                "html_snippet": html_content[:500],  # First 500 chars
+                "html_snippet": html_snippet,  # First 500 chars
                 "episode_steps": self.episode_steps,
                 "action_count": len(self.action_history)
             }
@@ -426,19 +561,16 @@ class PlaywrightEnv(OpenEnv):
 
         try:
             url = self.page.url.lower()
-            goal_lower = self.goal.lower()
 
             # Pattern matching examples
-            if "dashboard" in goal_lower and "dashboard" in url:
+            if self._goal_has_dashboard and "dashboard" in url:
                 return True
-            if "login" in goal_lower and "login" not in url:
+            if self._goal_has_login and "login" not in url:
                 # Successfully logged in (no longer on login page)
                 return True
-            if "navigate" in goal_lower:
-                # Check if target URL is in current URL
-                for word in goal_lower.split():
-                    if word in url and len(word) > 4:  # Skip short words
-                        return True
+            if self._goal_token_re is not None and self._goal_token_re.search(url):
+                # Target URL token found in current URL
+                return True
 
         except Exception as e:
             logger.warning(f"Goal check failed: {e}")
@@ -448,10 +580,17 @@ class PlaywrightEnv(OpenEnv):
     async def close(self):
         """Clean up resources"""
         try:
+            if self.browser_context:
+                await self.browser_context.close()
             if self.browser:
                 await self.browser.close()
             if self.playwright_context:
                 await self.playwright_context.__aexit__(None, None, None)
+            self.browser_context = None
+            self.page = None
+            self.browser = None
+            self.playwright_context = None
+            self._playwright = None
             logger.info("PlaywrightEnv closed")
         except Exception as e:
             logger.warning(f"Error closing PlaywrightEnv: {e}")
@@ -473,6 +612,9 @@ class SupabaseEnv(OpenEnv):
     - Support Agent: Debug customer data issues
     """
 
+    # Resolved lazily on first reset() so the module imports without supabase-py
+    _create_client: Optional[Callable[..., Any]] = None
+
     def __init__(self, supabase_url: str, supabase_key: str, agent_name: Optional[str] = None):
         """
         Initialize Supabase environment.
@@ -500,10 +642,18 @@ class SupabaseEnv(OpenEnv):
 
         logger.info(f"SupabaseEnv initialized: url={supabase_url}, agent={self.agent_name}")
 
+    @classmethod
+    def _load_create_client(cls) -> Callable[..., Any]:
+        """Import supabase.create_client once and cache it on the class"""
+        if cls._create_client is None:
+            from supabase import create_client
+            cls._create_client = create_client
+        return cls._create_client
+
     async def reset(self) -> EnvObservation:
         """Initialize Supabase client"""
         try:
-            from supabase import create_client, Client
+            create_client = self._load_create_client()
 
             self.client = create_client(self.url, self.key)
             self.episode_steps = 0
@@ -596,7 +746,7 @@ class SupabaseEnv(OpenEnv):
             self.operation_history.append({
                 **action,
                 "success": success,
-                "timestamp": datetime.now().isoformat()
+                "ts": time.time()  # Format via _iso_timestamp when needed
             })
 
             self.episode_reward += reward
@@ -625,7 +775,7 @@ class SupabaseEnv(OpenEnv):
                 **action,
                 "success": False,
                 "error": str(e),
-                "timestamp": datetime.now().isoformat()
+                "ts": time.time()  # Format via _iso_timestamp when needed
             })
 
             return EnvObservation(
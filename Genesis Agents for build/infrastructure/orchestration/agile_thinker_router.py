@@ -1,9 +1,17 @@
 # infrastructure/orchestration/agile_thinker_router.py
-from typing import Any, Optional, Dict, List
+from typing import Any, Optional, Dict, List, Tuple
 import asyncio
+import functools
+import hashlib
 import time
 import re
-from dataclasses import dataclass
+from collections import OrderedDict
+from dataclasses import dataclass, field
+
+try:  # Optional fast non-cryptographic hash for cache keys
+    import xxhash
+except ImportError:  # pragma: no cover - fall back to hashlib.blake2b
+    xxhash = None
 
 from infrastructure.htdag_planner import HTDAGPlanner
 from infrastructure.halo_router import HALORouter
@@ -21,6 +29,20 @@ class ReactivePattern:
     agent_name: str
     confidence: float
     avg_latency: float  # Historical average latency
+    _compiled: "re.Pattern[str]" = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self._compiled = re.compile(self.pattern)
+
+@functools.lru_cache(maxsize=1024)
+def _task_cache_key(task: str) -> bytes:
+    """Normalize and hash a task once; repeated tasks (hit path) skip re-encoding."""
+    # Fixed 16-byte digest: cheap to hash as a dict key regardless of prompt length
+    data = task.strip().lower().encode()
+    if xxhash is not None:
+        return xxhash.xxh3_128_digest(data)
+    return hashlib.blake2b(data, digest_size=16).digest()
+
 
 class AgileThinkerRouter:
     """
@@ -41,11 +63,12 @@ class AgileThinkerRouter:
         self.max_cache_size = max_cache_size
 
         # Reactive patterns (learned from TrajectoryPool)
-        self.reactive_patterns: List[ReactivePattern] = self._load_reactive_patterns()
+        self.reactive_patterns: Tuple[ReactivePattern, ...] = self._load_reactive_patterns()
+        self._reactive_prefilter = self._build_reactive_prefilter(self.reactive_patterns)
 
         # Result cache for instant responses with LRU eviction
-        self.result_cache: Dict[str, Any] = {}
-        self.cache_access_order: List[str] = []  # LRU tracking
+        # (OrderedDict order == recency: oldest first, most recently used last)
+        self.result_cache: "OrderedDict[bytes, Any]" = OrderedDict()
 
         # Performance tracking
         self.reactive_count = 0
@@ -73,14 +96,17 @@ class AgileThinkerRouter:
 
         # Check cache first
         cache_key = self._get_cache_key(task)
-        if cache_key in self.result_cache:
+        try:
+            cached = self.result_cache[cache_key]  # Single probe on both hit and miss
+        except KeyError:
+            pass
+        else:
             self.cache_hits += 1
             # Update LRU order
-            self.cache_access_order.remove(cache_key)
-            self.cache_access_order.append(cache_key)
+            self.result_cache.move_to_end(cache_key)
             logger.info(f"[AgileThinker] Cache hit for task '{task[:50]}...'")
             return {
-                "output": self.result_cache[cache_key],
+                "output": cached,
                 "method": "cache",
                 "latency": time.time() - start_time
             }
@@ -223,34 +249,49 @@ class AgileThinkerRouter:
         start_time: float
     ) -> Dict[str, Any]:
         """Run both threads, prefer planning result but fallback to reactive."""
-        # Launch both
+        # Launch both concurrently; each thread measures its own latency
         reactive_task = asyncio.create_task(
             self._reactive_thread_best_effort(task)
         )
         planning_task = asyncio.create_task(
-            self._planning_thread_only(task, start_time)
+            self._planning_thread_only(task, time.time())
         )
 
-        # Wait for planning (preferred)
-        try:
-            planning_result = await asyncio.wait_for(planning_task, timeout=30.0)
-            reactive_task.cancel()
-            return planning_result
+        # Wait for planning (preferred) while reactive keeps running
+        done, _ = await asyncio.wait({planning_task}, timeout=30.0)
+
+        if planning_task in done and planning_task.exception() is None:
+            await self._cancel_and_wait(reactive_task)
+            return planning_task.result()
 
-        except asyncio.TimeoutError:
+        if planning_task in done:
+            # Planning failed, use reactive
+            logger.warning(
+                f"[AgileThinker] Planning failed: {planning_task.exception()}, using reactive result"
+            )
+        else:
             # Planning too slow, use reactive
             logger.warning("[AgileThinker] Planning timeout, using reactive result")
-            planning_task.cancel()
-            reactive_result = await reactive_task
-            reactive_result["fallback"] = True
-            return reactive_result
-
+            await self._cancel_and_wait(planning_task)
+
+        reactive_result = await reactive_task
+        reactive_result["fallback"] = True
+        return reactive_result
+
+    @staticmethod
+    async def _cancel_and_wait(task_obj: asyncio.Task) -> None:
+        """Cancel a task and await it so its cancellation is fully processed."""
+        if task_obj.done():
+            if not task_obj.cancelled():
+                task_obj.exception()  # Mark exception as retrieved
+            return
+        task_obj.cancel()
+        try:
+            await task_obj
+        except asyncio.CancelledError:
+            pass
         except Exception as e:
-            # Planning failed, use reactive
-            logger.warning(f"[AgileThinker] Planning failed: {e}, using reactive result")
-            reactive_result = await reactive_task
-            reactive_result["fallback"] = True
-            return reactive_result
+            logger.debug(f"[AgileThinker] Cancelled task raised: {e}")
 
     async def _reactive_thread_best_effort(self, task: str) -> Dict[str, Any]:
         """Reactive thread with best-effort pattern matching."""
@@ -275,12 +316,26 @@ class AgileThinkerRouter:
         """Match task against reactive patterns."""
         task_lower = task.lower()
 
+        # Single pass over the task rejects the common no-match case for all patterns at once
+        if self._reactive_prefilter is None or not self._reactive_prefilter.search(task_lower):
+            return None
+
+        # Patterns are sorted by descending confidence, so the first hit is the best one
         for pattern in self.reactive_patterns:
-            if re.search(pattern.pattern, task_lower):
+            if pattern._compiled.search(task_lower):
                 return pattern
 
         return None
 
+    @staticmethod
+    def _build_reactive_prefilter(
+        patterns: Tuple[ReactivePattern, ...]
+    ) -> Optional["re.Pattern[str]"]:
+        """Combine all reactive patterns into one alternation regex (None if empty)."""
+        if not patterns:
+            return None
+        return re.compile("|".join(f"(?:{p.pattern})" for p in patterns))
+
     def _heuristic_agent_selection(self, task: str) -> str:
         """Heuristic-based agent selection when no pattern matches."""
         task_lower = task.lower()
@@ -297,11 +352,11 @@ class AgileThinkerRouter:
         else:
             return "builder_agent"  # Default
 
-    def _load_reactive_patterns(self) -> List[ReactivePattern]:
-        """Load reactive patterns from historical data."""
+    def _load_reactive_patterns(self) -> Tuple[ReactivePattern, ...]:
+        """Load reactive patterns from historical data, highest confidence first."""
         # In production, learn these from TrajectoryPool
         # For now, use hand-crafted patterns
-        return [
+        patterns = [
             ReactivePattern(
                 pattern=r"(generate|create|build).*(simple|basic).*(component|function)",
                 agent_name="builder_agent",
@@ -333,28 +388,22 @@ class AgileThinkerRouter:
                 avg_latency=3.5
             ),
         ]
+        return tuple(sorted(patterns, key=lambda p: -p.confidence))
 
-    def _get_cache_key(self, task: str) -> str:
+    def _get_cache_key(self, task: str) -> bytes:
         """Generate cache key for task."""
-        # Use full hash to avoid collisions (hex for readability)
-        import hashlib
-        return hashlib.sha256(task.lower().strip().encode()).hexdigest()[:16]
+        return _task_cache_key(task)
 
-    def _add_to_cache(self, key: str, value: Any) -> None:
+    def _add_to_cache(self, key: bytes, value: Any) -> None:
         """Add item to cache with LRU eviction."""
-        # Check if cache is full
-        if len(self.result_cache) >= self.max_cache_size and key not in self.result_cache:
+        if key in self.result_cache:
+            self.result_cache.move_to_end(key)
+        elif len(self.result_cache) >= self.max_cache_size:
             # Evict least recently used
-            if self.cache_access_order:
-                lru_key = self.cache_access_order.pop(0)
-                self.result_cache.pop(lru_key, None)
-                logger.debug(f"[AgileThinker] Evicted LRU cache entry")
+            self.result_cache.popitem(last=False)
+            logger.debug(f"[AgileThinker] Evicted LRU cache entry")
 
-        # Add to cache
         self.result_cache[key] = value
-        if key in self.cache_access_order:
-            self.cache_access_order.remove(key)
-        self.cache_access_order.append(key)
 
     async def _execute_dag(self, dag) -> Any:
         """Execute TaskDAG (placeholder - use actual HTDAG execution)."""
@@ -387,9 +436,12 @@ def get_agile_thinker(
 ) -> AgileThinkerRouter:
     """Get singleton AgileThinker instance (thread-safe)."""
     global _agile_thinker
+    # Lock-free fast path: under CPython's GIL a module-global read/assignment is
+    # atomic, so a non-None value is always a fully constructed router. The lock
+    # only serializes first-time construction (same pattern as get_replay_buffer).
     if _agile_thinker is None:
         with _agile_thinker_lock:
-            # Double-check locking pattern
+            # Re-check under the lock: another thread may have initialized it
             if _agile_thinker is None:
                 if htdag_planner is None or halo_router is None:
                     raise ValueError("Must provide htdag_planner and halo_router on first call")
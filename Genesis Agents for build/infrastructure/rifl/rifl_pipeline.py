@@ -9,9 +9,35 @@ the RIFL stages so we can swap in model-driven evaluators later.
 
 from __future__ import annotations
 
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
+import functools
 import re
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Set, Tuple
+
+_WORD5 = re.compile(r"[a-zA-Z]{5,}")
+
+# Substrings probed on every evaluation (placeholder code / logging present)
+_SENTINEL_TERMS: Tuple[str, ...] = ("todo", "pass", "logger")
+
+
+@functools.lru_cache(maxsize=256)
+def _term_scanner(terms: Tuple[str, ...]) -> Optional["re.Pattern[str]"]:
+    """Compile rubric terms into one alternation scanned in a single pass."""
+    if not terms:
+        return None
+    alternation = "|".join(re.escape(t) for t in sorted(terms, key=len, reverse=True))
+    # Zero-width lookahead reports a match at every position, so overlapping terms are all seen
+    return re.compile(f"(?=({alternation}))")
+
+
+def _present_terms(text: str, terms: Tuple[str, ...]) -> Set[str]:
+    """Return the subset of ``terms`` that occur as substrings of ``text``."""
+    scanner = _term_scanner(terms)
+    if scanner is None:
+        return set()
+    found = {match.group(1) for match in scanner.finditer(text)}
+    # A term that is a prefix of a longer term matched at the same position is shadowed by it
+    return {t for t in terms if t in found or any(f.startswith(t) for f in found)}
 
 
 @dataclass
@@ -23,7 +49,11 @@ class RIFLRubric:
     risk_clauses: List[str]
 
     def to_dict(self) -> Dict[str, Any]:
-        return asdict(self)
+        return {
+            "improvement_type": self.improvement_type,
+            "keywords": list(self.keywords),
+            "risk_clauses": list(self.risk_clauses),
+        }
 
 
 class RIFLPromptEvaluator:
@@ -48,11 +78,14 @@ class RIFLPromptEvaluator:
         rubric = self._build_rubric(diagnosis, improvement_type)
         code_lower = improved_code.lower()
 
-        keyword_hits = sum(1 for kw in rubric.keywords if kw in code_lower)
-        risk_hits = sum(1 for clause in rubric.risk_clauses if clause in code_lower)
+        # Rubric terms and sentinel probes share one pass over the code
+        terms = tuple(dict.fromkeys([*rubric.keywords, *rubric.risk_clauses, *_SENTINEL_TERMS]))
+        present = _present_terms(code_lower, terms)
+        keyword_hits = sum(1 for kw in rubric.keywords if kw in present)
+        risk_hits = sum(1 for clause in rubric.risk_clauses if clause in present)
 
-        contains_todo = "todo" in code_lower or "pass" in code_lower
-        contains_logger = "logger" in code_lower
+        contains_todo = "todo" in present or "pass" in present
+        contains_logger = "logger" in present
 
         if len(rubric.keywords) > 4:
             required_hits = 3
@@ -61,7 +94,13 @@ class RIFLPromptEvaluator:
         else:
             required_hits = 2
         satisfied = keyword_hits + risk_hits
-        line_count = len([line for line in improved_code.splitlines() if line.strip()])
+        # Only ">= 4 non-empty lines" matters, so stop counting once it is reached
+        line_count = 0
+        for line in improved_code.splitlines():
+            if line.strip():
+                line_count += 1
+                if line_count >= 4:
+                    break
         if contains_todo:
             verdict = "fail"
             reward = 0.0
@@ -97,33 +136,22 @@ class RIFLPromptEvaluator:
         if "error_handling" in type_lower:
             risk_clauses.extend(["logger", "warning", "fallback"])
 
-        # Deduplicate while preserving order
-        seen = set()
-        deduped_keywords = []
-        for kw in keywords:
-            if kw not in seen:
-                seen.add(kw)
-                deduped_keywords.append(kw)
-
-        seen.clear()
-        deduped_risks = []
-        for clause in risk_clauses:
-            if clause not in seen:
-                seen.add(clause)
-                deduped_risks.append(clause)
+        # Deduplicate while preserving order (keywords are already unique)
+        deduped_risks = list(dict.fromkeys(risk_clauses))
 
         return RIFLRubric(
             improvement_type=improvement_type,
-            keywords=deduped_keywords,
+            keywords=keywords,
             risk_clauses=deduped_risks,
         )
 
     def _extract_keywords(self, text: str, max_terms: int = 5) -> List[str]:
-        words = re.findall(r"[a-zA-Z]{5,}", text.lower())
+        seen = set()
         keywords = []
-        for word in words:
-            if word not in keywords:
+        for word in _WORD5.findall(text.lower()):
+            if word not in seen:
+                seen.add(word)
                 keywords.append(word)
-            if len(keywords) >= max_terms:
-                break
+                if len(keywords) >= max_terms:
+                    break
         return keywords or ["robust", "validate"]
@@ -11,9 +11,9 @@ from __future__ import annotations
 
 import json
 import os
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, List, Literal, Optional
+from typing import Dict, List, Literal, Optional, Tuple
 
 from infrastructure.task_dag import TaskDAG, Task
 
@@ -32,7 +32,15 @@ class RubricCriterion:
     evaluation_prompt: str
 
     def to_dict(self) -> Dict[str, str]:
-        return asdict(self)
+        # Explicit literal: all fields are scalars, so asdict's deepcopy is wasted work
+        return {
+            "rubric_id": self.rubric_id,
+            "criterion_id": self.criterion_id,
+            "dimension": self.dimension,
+            "description": self.description,
+            "weight": self.weight,
+            "evaluation_prompt": self.evaluation_prompt,
+        }
 
 
 class ResearchRubricDataset:
@@ -61,7 +69,7 @@ class ResearchRubricDataset:
             payload = json.load(f)
 
         rubrics = payload.get("rubrics", [])
-        self._by_dimension: Dict[RubricDimension, List[RubricCriterion]] = {
+        by_dimension: Dict[RubricDimension, List[RubricCriterion]] = {
             "breadth": [],
             "depth": [],
             "ambiguity": [],
@@ -71,7 +79,7 @@ class ResearchRubricDataset:
             rubric_id = rubric["id"]
             dimension: RubricDimension = rubric["dimension"]
             for criterion in rubric.get("criteria", []):
-                self._by_dimension[dimension].append(
+                by_dimension[dimension].append(
                     RubricCriterion(
                         rubric_id=rubric_id,
                         criterion_id=criterion["id"],
@@ -82,9 +90,26 @@ class ResearchRubricDataset:
                     )
                 )
 
-    def get_criteria(self, dimension: RubricDimension) -> List[RubricCriterion]:
-        """Return all criteria for a dimension."""
-        return list(self._by_dimension.get(dimension, []))
+
+        # Immutable per-dimension index: callers can share it without copying.
+        self._by_dimension: Dict[RubricDimension, Tuple[RubricCriterion, ...]] = {
+            dim: tuple(criteria) for dim, criteria in by_dimension.items()
+        }
+        self._limited: Dict[Tuple[RubricDimension, int], Tuple[RubricCriterion, ...]] = {}
+
+    def get_criteria(
+        self, dimension: RubricDimension, limit: Optional[int] = None
+    ) -> Tuple[RubricCriterion, ...]:
+        """Return criteria for a dimension, optionally trimmed to ``limit``."""
+        if limit is None:
+            return self._by_dimension.get(dimension, ())
+        key = (dimension, limit)
+        try:
+            return self._limited[key]
+        except KeyError:
+            trimmed = self._by_dimension.get(dimension, ())[:limit]
+            self._limited[key] = trimmed
+            return trimmed
 
 
 # Task type -> rubric dimensions heuristic mapping
@@ -103,16 +128,25 @@ TASK_TYPE_DIMENSIONS: Dict[str, List[RubricDimension]] = {
 }
 
 
+# Substrings that win over exact/prefix lookups anywhere in the task type
+_DIMENSION_SUBSTRING_HITS: Tuple[Tuple[str, List[RubricDimension]], ...] = (
+    ("research", ["breadth", "depth"]),
+    ("market", ["breadth", "depth"]),
+)
+
+
 def _infer_dimensions(task: Task) -> List[RubricDimension]:
-    if not task.task_type:
+    task_type = (task.task_type or "").lower()
+    if not task_type:
         return []
 
-    task_type = task.task_type.lower()
-    if "research" in task_type or "market" in task_type:
-        return ["breadth", "depth"]
-    if task_type in TASK_TYPE_DIMENSIONS:
-        return TASK_TYPE_DIMENSIONS[task_type]
-    return TASK_TYPE_DIMENSIONS.get(task_type.split("_")[0], [])
+    for substring, dimensions in _DIMENSION_SUBSTRING_HITS:
+        if substring in task_type:
+            return dimensions
+    return (
+        TASK_TYPE_DIMENSIONS.get(task_type)
+        or TASK_TYPE_DIMENSIONS.get(task_type.split("_", 1)[0], [])
+    )
 
 
 def apply_research_rubrics_to_dag(
@@ -141,8 +175,7 @@ def apply_research_rubrics_to_dag(
 
         criteria: List[RubricCriterion] = []
         for dim in dimensions:
-            dim_criteria = dataset.get_criteria(dim)[:max_criteria_per_dimension]
-            criteria.extend(dim_criteria)
+            criteria.extend(dataset.get_criteria(dim, max_criteria_per_dimension))
 
         if not criteria:
             continue
@@ -4,10 +4,32 @@ from __future__ import annotations
 
 import re
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
 
 from infrastructure.task_dag import TaskDAG
 
+# Heuristic scoring patterns, compiled once at import.
+_BREADTH_SPLIT = re.compile(r"[\n;,]|\band\b|\bor\b")
+
+# Depth/ambiguity cue words -> features they signal.  A word may feed several
+# features ("risk" is both a counter-argument and a risk-mitigation cue).
+_FEATURE_WORDS: Dict[str, Tuple[str, ...]] = {}
+for _feature, _words in (
+    ("cause", ("because", "due to", "since", "therefore")),
+    ("evidence", ("data", "evidence", "metrics", "study", "survey")),
+    ("counter", ("counter", "risk", "failure", "drawback")),
+    ("assume", ("assume", "assumption", "hypothesis", "uncertain")),
+    ("risk", ("risk", "mitigation", "monitor", "alert")),
+):
+    for _word in _words:
+        _FEATURE_WORDS[_word] = _FEATURE_WORDS.get(_word, ()) + (_feature,)
+del _feature, _words, _word
+
+# One scan over the text finds every cue word and digit.
+_FEATURE_RE = re.compile(
+    r"\b(" + "|".join(map(re.escape, _FEATURE_WORDS)) + r")\b|(\d)"
+)
+
 
 @dataclass
 class RubricCriterionScore:
@@ -127,15 +149,26 @@ class RubricEvaluationHook:
     ) -> List[RubricCriterionScore]:
         scores: List[RubricCriterionScore] = []
         normalized_output = self._normalize_output(task_output)
+        excerpt = normalized_output[:280].strip() if normalized_output else None
+        token_count = len(normalized_output.split()) if normalized_output else 0
+        features = (
+            self._scan_features(normalized_output)
+            if normalized_output and token_count >= self.min_tokens
+            else None
+        )
+
+        # Criteria sharing a dimension share one (score, status) computation.
+        dimension_results: Dict[str, Tuple[Optional[float], str]] = {}
 
         for criterion in criteria:
-            score, status = self._evaluate_criterion(
-                normalized_output,
-                criterion.get("dimension"),
-            )
-            excerpt = (
-                normalized_output[:280].strip() if normalized_output else None
-            )
+            dimension = (criterion.get("dimension") or "").lower()
+            result = dimension_results.get(dimension)
+            if result is None:
+                result = self._evaluate_criterion(
+                    normalized_output, dimension, token_count, features
+                )
+                dimension_results[dimension] = result
+            score, status = result
             scores.append(
                 RubricCriterionScore(
                     criterion_id=criterion.get("criterion_id", ""),
@@ -163,11 +196,14 @@ class RubricEvaluationHook:
         self,
         text: Optional[str],
         dimension: Optional[str],
+        token_count: Optional[int] = None,
+        features: Optional[FrozenSet[str]] = None,
     ) -> Tuple[Optional[float], str]:
         if not text:
             return None, "pending"
 
-        token_count = len(text.split())
+        if token_count is None:
+            token_count = len(text.split())
         if token_count < self.min_tokens:
             # Encourage richer responses by marking short outputs as partial.
             return 0.4, "partial"
@@ -176,9 +212,9 @@ class RubricEvaluationHook:
         if dimension == "breadth":
             score = self._score_breadth(text)
         elif dimension == "depth":
-            score = self._score_depth(text)
+            score = self._score_depth(text, features)
         elif dimension == "ambiguity":
-            score = self._score_ambiguity(text)
+            score = self._score_ambiguity(text, features)
         else:
             score = 0.5
 
@@ -192,31 +228,45 @@ class RubricEvaluationHook:
         return score, status
 
     def _score_breadth(self, text: str) -> float:
-        segments = re.split(r"[\n;,]|\band\b|\bor\b", text.lower())
+        segments = _BREADTH_SPLIT.split(text.lower())
         meaningful = [seg.strip() for seg in segments if len(seg.strip()) >= 8]
         unique_segments = len(set(meaningful))
         return min(unique_segments / 4.0, 1.0)
 
-    def _score_depth(self, text: str) -> float:
-        lowered = text.lower()
-        hits = 0
-        if re.search(r"\b(because|due to|since|therefore)\b", lowered):
-            hits += 1
-        if re.search(r"\b(data|evidence|metrics|study|survey)\b", lowered):
-            hits += 1
-        if re.search(r"\b(counter|risk|failure|drawback)\b", lowered):
-            hits += 1
-        if re.search(r"\\d", text):
-            hits += 1
+    def _scan_features(self, text: str) -> FrozenSet[str]:
+        """Collect depth/ambiguity cue features in a single pass over ``text``."""
+        features = set()
+        for match in _FEATURE_RE.finditer(text.lower()):
+            word = match.group(1)
+            if word is None:
+                features.add("digit")
+            else:
+                features.update(_FEATURE_WORDS[word])
+        if "?" in text:
+            features.add("question")
+        return frozenset(features)
+
+    def _score_depth(
+        self, text: str, features: Optional[FrozenSet[str]] = None
+    ) -> float:
+        if features is None:
+            features = self._scan_features(text)
+        hits = sum(
+            1 for feature in ("cause", "evidence", "counter", "digit")
+            if feature in features
+        )
         return min(hits / 3.0, 1.0)
 
-    def _score_ambiguity(self, text: str) -> float:
-        lowered = text.lower()
+    def _score_ambiguity(
+        self, text: str, features: Optional[FrozenSet[str]] = None
+    ) -> float:
+        if features is None:
+            features = self._scan_features(text)
         hits = 0
-        if re.search(r"\b(assume|assumption|hypothesis|uncertain)\b", lowered):
+        if "assume" in features:
             hits += 1
-        if re.search(r"\b(risk|mitigation|monitor|alert)\b", lowered):
+        if "risk" in features:
             hits += 1
-        if "?" in text:
+        if "question" in features:
             hits += 0.5
         return min(hits / 2.0, 1.0)
@@ -18,7 +18,10 @@ DESIGN PRINCIPLES:
 """
 
 import ast
+import keyword
 import logging
+import re
+from collections import OrderedDict
 from typing import Any, Dict, List, Optional, Tuple
 from dataclasses import dataclass
 
@@ -38,7 +41,7 @@ class ValidationResult:
 
 
 # ALLOWLIST: Only these pyautogui functions are permitted
-SAFE_PYAUTOGUI_FUNCTIONS = {
+SAFE_PYAUTOGUI_FUNCTIONS = frozenset({
     # Mouse operations
     'click', 'doubleClick', 'tripleClick', 'rightClick', 'middleClick',
     'moveTo', 'moveRel', 'dragTo', 'dragRel',
@@ -59,7 +62,7 @@ SAFE_PYAUTOGUI_FUNCTIONS = {
     # Utility (read-only, safe)
     'sleep', 'pause',
     'locateOnScreen', 'locateCenterOnScreen',
-}
+})
 
 # BLOCKLIST: These are NEVER allowed
 BLOCKED_PATTERNS = [
@@ -73,6 +76,100 @@ BLOCKED_PATTERNS = [
     'globals()', 'locals()',  # No scope inspection
 ]
 
+# Single-pass scanner over lowercased code for all blocked patterns (longest first)
+_BLOCKED_RE = re.compile(
+    "|".join(re.escape(p.lower()) for p in sorted(BLOCKED_PATTERNS, key=len, reverse=True))
+)
+
+
+# Fast path for the common single-call form, e.g. pyautogui.click(100, 200) or
+# pyautogui.write('hello', interval=0.1): literal/name arguments only, no nested
+# calls, so the AST visitor could not reject it if the function is allowlisted.
+# Compiled with re.ASCII and same-line whitespace only: anything the Python
+# tokenizer might reject (non-ASCII identifiers/digits, \v, \r, NUL, ...)
+# must fall through to the full ast.parse.
+_FAST_NAME = (  # identifier or True/False/None, never another keyword
+    r"(?!(?:" + "|".join(k for k in keyword.kwlist if k not in ("True", "False", "None")) + r")\b)"
+    r"[A-Za-z_]\w*"
+)
+_FAST_KWNAME = r"(?!(?:" + "|".join(keyword.kwlist) + r")\b)[A-Za-z_]\w*"
+_FAST_ARG = (
+    r"(?:-?(?:0|[1-9]\d*)(?:\.\d+)?|'[^'\\\n\r\0]*'|\"[^\"\\\n\r\0]*\"|" + _FAST_NAME + r")"
+)
+_FAST_KWARG = _FAST_KWNAME + r"[ \t]*=[ \t]*" + _FAST_ARG
+_FAST_ARGS = (
+    r"(?:" + _FAST_ARG + r"(?:[ \t]*,[ \t]*" + _FAST_ARG + r")*(?:[ \t]*,[ \t]*" + _FAST_KWARG + r")*"
+    r"|" + _FAST_KWARG + r"(?:[ \t]*,[ \t]*" + _FAST_KWARG + r")*)"
+)
+_FAST_CALL_RE = re.compile(
+    r"^pyautogui\.([A-Za-z_]\w*)\([ \t]*(?:" + _FAST_ARGS + r"[ \t]*,?[ \t]*)?\)[ \t]*\Z",
+    re.ASCII,
+)
+
+
+class _UnsafeCodeError(Exception):
+    """Raised by _SafetyVisitor to abort traversal on the first violation"""
+
+
+class _SafetyVisitor:
+    """
+    AST visitor enforcing the PyAutoGUI allowlist.
+
+    Node types are dispatched to visit_<ClassName> handlers, so each node is
+    checked once instead of running an isinstance chain per node. Traversal
+    uses an explicit stack: deeply nested (but valid) expressions must not hit
+    Python's recursion limit the way a recursive NodeVisitor would.
+    """
+
+    def visit(self, tree: ast.AST) -> None:
+        # Pre-order depth-first; children are pushed reversed so they pop in
+        # source order. A raised _UnsafeCodeError stops at the first violation.
+        stack = [tree]
+        while stack:
+            node = stack.pop()
+            handler = getattr(self, "visit_" + node.__class__.__name__, None)
+            if handler is not None:
+                handler(node)
+            stack.extend(reversed(list(ast.iter_child_nodes(node))))
+
+    def visit_Import(self, node: ast.AST) -> None:
+        # Block: Import statements
+        raise _UnsafeCodeError("Import statements not allowed")
+
+    visit_ImportFrom = visit_Import
+
+    def visit_FunctionDef(self, node: ast.AST) -> None:
+        # Block: Function definitions (prevent code injection)
+        raise _UnsafeCodeError("Function/class definitions not allowed")
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+    visit_ClassDef = visit_FunctionDef
+
+    def visit_Call(self, node: ast.Call) -> None:
+        func = node.func
+        if isinstance(func, ast.Name):
+            # Block: Exec/eval/compile
+            if func.id in ('exec', 'eval', 'compile', '__import__'):
+                raise _UnsafeCodeError(f"Dangerous function call: {func.id}()")
+            # Direct function call (not module.function)
+            # Prefer explicit pyautogui.function() syntax
+            raise _UnsafeCodeError(
+                f"Direct function calls not allowed. Use pyautogui.{func.id}() instead"
+            )
+
+        # Validate: Only pyautogui.* function calls allowed
+        if isinstance(func, ast.Attribute) and isinstance(func.value, ast.Name):
+            if func.value.id != 'pyautogui':
+                raise _UnsafeCodeError(
+                    f"Only pyautogui.* calls allowed, got: {func.value.id}.{func.attr}()"
+                )
+
+            # Check if function is in allowlist
+            if func.attr not in SAFE_PYAUTOGUI_FUNCTIONS:
+                raise _UnsafeCodeError(
+                    f"PyAutoGUI function not in allowlist: {func.attr}()"
+                )
+
 
 class SafePyAutoGUIExecutor:
     """
@@ -86,17 +183,22 @@ class SafePyAutoGUIExecutor:
         result = executor.execute("pyautogui.click(100, 200)")
     """
 
-    def __init__(self, timeout_seconds: int = 30):
+    def __init__(self, timeout_seconds: int = 30, max_validation_cache: int = 512):
         """
         Initialize safe executor
 
         Args:
             timeout_seconds: Maximum execution time per action
+            max_validation_cache: Max distinct action strings whose validation is memoized
         """
         self.timeout_seconds = timeout_seconds
         self.execution_count = 0
         self.blocked_attempts = 0
 
+        # LRU cache of validation results keyed by exact code string
+        self.max_validation_cache = max_validation_cache
+        self._validation_cache: "OrderedDict[str, ValidationResult]" = OrderedDict()
+
     def validate_action_code(self, code: str) -> ValidationResult:
         """
         Validate action code using AST parsing
@@ -107,14 +209,33 @@ class SafePyAutoGUIExecutor:
         Returns:
             ValidationResult with safety status and any errors
         """
+        # Agent-S replays identical actions often; skip re-parsing them
+        cached = self._validation_cache.get(code)
+        if cached is not None:
+            self._validation_cache.move_to_end(code)
+            return cached
+
+        result = self._validate_uncached(code)
+
+        self._validation_cache[code] = result
+        if len(self._validation_cache) > self.max_validation_cache:
+            self._validation_cache.popitem(last=False)
+        return result
+
+    def _validate_uncached(self, code: str) -> ValidationResult:
+        """Run the blocklist pre-filter and AST validation for ``code``"""
         # Check for blocked patterns (fast pre-filter)
-        code_lower = code.lower()
-        for blocked in BLOCKED_PATTERNS:
-            if blocked.lower() in code_lower:
-                return ValidationResult(
-                    is_safe=False,
-                    error=f"Blocked pattern detected: {blocked}"
-                )
+        blocked = _BLOCKED_RE.search(code.lower())
+        if blocked:
+            return ValidationResult(
+                is_safe=False,
+                error=f"Blocked pattern detected: {blocked.group(0)}"
+            )
+
+        # Fast path: a single allowlisted call with literal arguments needs no AST walk
+        fast = _FAST_CALL_RE.match(code)
+        if fast and fast.group(1) in SAFE_PYAUTOGUI_FUNCTIONS:
+            return ValidationResult(is_safe=True)
 
         # Parse with AST
         try:
@@ -124,57 +245,18 @@ class SafePyAutoGUIExecutor:
                 is_safe=False,
                 error=f"Syntax error: {e}"
             )
+        except (RecursionError, MemoryError):
+            # The parser itself can give up on pathologically nested input
+            return ValidationResult(
+                is_safe=False,
+                error="Code is too deeply nested to validate"
+            )
 
-        # Validate AST nodes
-        for node in ast.walk(tree):
-            # Block: Import statements
-            if isinstance(node, (ast.Import, ast.ImportFrom)):
-                return ValidationResult(
-                    is_safe=False,
-                    error="Import statements not allowed"
-                )
-
-            # Block: Function definitions (prevent code injection)
-            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
-                return ValidationResult(
-                    is_safe=False,
-                    error="Function/class definitions not allowed"
-                )
-
-            # Block: Exec/eval/compile
-            if isinstance(node, ast.Call):
-                if isinstance(node.func, ast.Name):
-                    if node.func.id in ('exec', 'eval', 'compile', '__import__'):
-                        return ValidationResult(
-                            is_safe=False,
-                            error=f"Dangerous function call: {node.func.id}()"
-                        )
-
-            # Validate: Only pyautogui.* function calls allowed
-            if isinstance(node, ast.Call):
-                if isinstance(node.func, ast.Attribute):
-                    # Check for pyautogui.function_name() pattern
-                    if isinstance(node.func.value, ast.Name):
-                        if node.func.value.id != 'pyautogui':
-                            return ValidationResult(
-                                is_safe=False,
-                                error=f"Only pyautogui.* calls allowed, got: {node.func.value.id}.{node.func.attr}()"
-                            )
-
-                        # Check if function is in allowlist
-                        if node.func.attr not in SAFE_PYAUTOGUI_FUNCTIONS:
-                            return ValidationResult(
-                                is_safe=False,
-                                error=f"PyAutoGUI function not in allowlist: {node.func.attr}()"
-                            )
-                elif isinstance(node.func, ast.Name):
-                    # Direct function call (not module.function)
-                    # Only allow if it's a whitelisted pyautogui function
-                    # But prefer explicit pyautogui.function() syntax
-                    return ValidationResult(
-                        is_safe=False,
-                        error=f"Direct function calls not allowed. Use pyautogui.{node.func.id}() instead"
-                    )
+        # Validate AST nodes (visitor stops at the first violation)
+        try:
+            _SafetyVisitor().visit(tree)
+        except _UnsafeCodeError as e:
+            return ValidationResult(is_safe=False, error=str(e))
 
         return ValidationResult(is_safe=True)
 
@@ -16,18 +16,96 @@ FastAPI workers or background tasks.
 
 from __future__ import annotations
 
+import asyncio
+import functools
 import json
+import logging
+import math
 import os
+import queue
 import sqlite3
+import string
 import threading
 import uuid
-from dataclasses import dataclass, field, asdict
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
 
 DEFAULT_DB_PATH = Path("data/sessions/genesis_sessions.db")
 DEFAULT_TTL_HOURS = int(os.getenv("GENESIS_SESSION_TTL_HOURS", "720"))  # 30 days
+DEFAULT_READ_POOL_SIZE = int(os.getenv("GENESIS_SESSION_READ_POOL", "4"))
+DEFAULT_FLUSH_INTERVAL_SECONDS = 0.5
+DEFAULT_FLUSH_BATCH_SIZE = 50
+
+logger = logging.getLogger(__name__)
+
+# Hot-path statements live at module level so every call hands sqlite3 the
+# same string and hits its per-connection prepared-statement cache.
+_SQL_SESSION_OWNER = "SELECT user_id FROM sessions WHERE session_id = ?"
+_SQL_LAST_SEQUENCE = (
+    "SELECT COALESCE(MAX(sequence), 0) AS seq FROM events WHERE session_id = ?"
+)
+_SQL_INSERT_EVENT = (
+    "INSERT INTO events (session_id, sequence, role, content, payload, created_at) "
+    "VALUES (?, ?, ?, ?, ?, ?)"
+)
+# SQLite >= 3.35 can assign the next sequence inside the INSERT and hand it
+# back via RETURNING. The MAX() is evaluated by the INSERT itself, so another
+# connection appending to the same session can never hand out a stale value.
+_HAS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+_SQL_INSERT_EVENT_RETURNING = (
+    "INSERT INTO events (session_id, sequence, role, content, payload, created_at) "
+    "VALUES (?1, (SELECT COALESCE(MAX(sequence), 0) + 1 "
+    "FROM events WHERE session_id = ?1), ?2, ?3, ?4, ?5) "
+    "RETURNING sequence"
+)
+_SQL_TOUCH_SESSION = (
+    "UPDATE sessions SET updated_at = ?, expires_at = ?, event_count = event_count + ? "
+    "WHERE session_id = ?"
+)
+_SQL_BUMP_EVENT_COUNT = (
+    "UPDATE sessions SET event_count = event_count + ? WHERE session_id = ?"
+)
+_SQL_EVENT_COUNT = "SELECT event_count FROM sessions WHERE session_id = ?"
+# The WHERE turns a cross-user upsert into a no-op (rowcount 0) so the
+# ownership check is atomic with the write.
+_SQL_UPSERT_SESSION = (
+    "INSERT INTO sessions (session_id, user_id, created_at, updated_at, expires_at, metadata) "
+    "VALUES (?, ?, ?, ?, ?, ?) "
+    "ON CONFLICT(session_id) DO UPDATE SET "
+    "updated_at = excluded.updated_at, "
+    "expires_at = excluded.expires_at, "
+    "metadata = COALESCE(excluded.metadata, sessions.metadata) "
+    "WHERE sessions.user_id = excluded.user_id"
+)
+_SQL_EVENTS_FROM = (
+    "SELECT sequence, role, content, payload, created_at FROM events "
+    "WHERE session_id = ? AND sequence > ? ORDER BY sequence ASC"
+)
+_ITER_FETCH_SIZE = 256
+_USER_ID_EXTRA_CHARS = frozenset("-_@")
+# Deletes every ASCII character that is neither alphanumeric nor allowed extra.
+_USER_ID_ASCII_STRIP = str.maketrans(
+    "",
+    "",
+    "".join(
+        chr(i)
+        for i in range(128)
+        if chr(i) not in _USER_ID_EXTRA_CHARS
+        and chr(i) not in string.ascii_letters + string.digits
+    ),
+)
+_STATEMENT_CACHE_SIZE = 256
+MAINTENANCE_EVERY_N_PURGES = 100
 
 
 def _utc_now() -> datetime:
@@ -38,6 +116,72 @@ def _iso(dt: datetime) -> str:
     return dt.isoformat()
 
 
+def _has_non_finite(value: Any) -> bool:
+    """True if a NaN/Infinity float appears anywhere inside value."""
+    stack = [value]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, float):
+            if not math.isfinite(item):
+                return True
+        elif isinstance(item, dict):
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple)):
+            stack.extend(item)
+    return False
+
+
+def _dump_payload(payload: Dict[str, Any]) -> bytes:
+    """Serialize an event payload to the UTF-8 JSON stored in the BLOB column."""
+    if orjson is not None:
+        try:
+            encoded = orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            pass  # e.g. >64-bit ints; stdlib handles those
+        else:
+            # orjson turns NaN/Infinity into null. Those only ever show up as
+            # null, so skip the scan otherwise; when present, fall back to the
+            # stdlib encoding (NaN/Infinity tokens) the store always wrote.
+            if b"null" not in encoded or not _has_non_finite(payload):
+                return encoded
+    return json.dumps(payload, ensure_ascii=False).encode("utf-8")
+
+
+def _load_payload(raw: Any) -> Dict[str, Any]:
+    # Rows written before the BLOB switch hold TEXT; both decode the same way.
+    if not raw:
+        return {}
+    if orjson is not None:
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            pass  # NaN/Infinity tokens, accepted by the stdlib parser only
+    return json.loads(raw)
+
+
+def _on_db_thread(method):
+    """Run ``method`` on the store's dedicated DB thread when one is in use."""
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        executor = self._db_executor
+        if executor is None or threading.get_ident() == self._db_thread_id:
+            return method(self, *args, **kwargs)
+        return executor.submit(method, self, *args, **kwargs).result()
+
+    return wrapper
+
+
+def _event_dict(row: sqlite3.Row) -> Dict[str, Any]:
+    return {
+        "sequence": row["sequence"],
+        "role": row["role"],
+        "content": row["content"],
+        "payload": _load_payload(row["payload"]),
+        "created_at": row["created_at"],
+    }
+
+
 @dataclass
 class SessionEvent:
     """Represents a single event in a session timeline."""
@@ -48,11 +192,6 @@ class SessionEvent:
     sequence: Optional[int] = None
     created_at: str = field(default_factory=lambda: _iso(_utc_now()))
 
-    def to_record(self) -> Dict[str, Any]:
-        record = asdict(self)
-        record["payload"] = json.dumps(self.payload, ensure_ascii=False)
-        return record
-
 
 class SessionStore:
     """
@@ -69,24 +208,89 @@ class SessionStore:
         db_path: Path | str = DEFAULT_DB_PATH,
         default_ttl_hours: int = DEFAULT_TTL_HOURS,
         extend_ttl_on_write: bool = True,
+        read_pool_size: int = DEFAULT_READ_POOL_SIZE,
+        buffered: bool = False,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL_SECONDS,
+        flush_batch_size: int = DEFAULT_FLUSH_BATCH_SIZE,
     ):
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
         self.default_ttl = max(1, int(default_ttl_hours))
         self.extend_ttl_on_write = extend_ttl_on_write
-        self._lock = threading.RLock()
-        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
-        self._conn.row_factory = sqlite3.Row
-        self._configure_connection()
-        self._init_schema()
+        self._lock = threading.Lock()
+        self._purge_calls = 0
+        # Buffered mode trades durability for throughput: append_event only
+        # queues the event and a timer (or a full batch) writes it with one
+        # transaction per session. Unflushed events are lost on a crash and
+        # are not visible to reads until flushed.
+        self.buffered = buffered
+        self.flush_interval = max(0.01, float(flush_interval))
+        self.flush_batch_size = max(1, int(flush_batch_size))
+        self._pending: Deque[Tuple[str, str, SessionEvent, bytes]] = deque()
+        # Owner of each session that only exists in the buffer so far, so a
+        # second user cannot queue into a session that is not yet created.
+        self._pending_owners: Dict[str, str] = {}
+        self._pending_lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._flush_timer: Optional[threading.Timer] = None
+        # check_same_thread=False is only sound when SQLite was built
+        # thread-safe. A single-thread build (threadsafety 0) corrupts
+        # silently when shared, so confine every connection to one thread.
+        self._db_executor: Optional[ThreadPoolExecutor] = None
+        self._db_thread_id: Optional[int] = None
+        if sqlite3.threadsafety < 1:
+            logger.warning(
+                "SQLite library is not thread-safe (threadsafety=0); "
+                "routing all SessionStore access through a single thread"
+            )
+            self._db_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="session-db")
+            self._db_thread_id = self._db_executor.submit(threading.get_ident).result()
+            read_pool_size = 1
+        self._setup_connections(read_pool_size)
 
     # ------------------------------------------------------------------ #
     # connection + schema helpers
     # ------------------------------------------------------------------ #
-    def _configure_connection(self) -> None:
-        with self._conn:
-            self._conn.execute("PRAGMA journal_mode=WAL;")
-            self._conn.execute("PRAGMA foreign_keys=ON;")
+    @_on_db_thread
+    def _setup_connections(self, read_pool_size: int) -> None:
+        self._conn = self._open_connection()
+        self._init_schema()
+        # WAL lets readers run alongside the single writer, so reads borrow
+        # from their own pool instead of queueing behind _lock.
+        self._read_pool: "queue.Queue[sqlite3.Connection]" = queue.Queue()
+        for _ in range(max(1, int(read_pool_size))):
+            self._read_pool.put(self._open_connection())
+
+    def _open_connection(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self.db_path,
+            check_same_thread=self._db_executor is not None,
+            cached_statements=_STATEMENT_CACHE_SIZE,
+        )
+        conn.row_factory = sqlite3.Row
+        self._configure_connection(conn)
+        return conn
+
+    @staticmethod
+    def _configure_connection(conn: sqlite3.Connection) -> None:
+        with conn:
+            conn.execute("PRAGMA journal_mode=WAL;")
+            # WAL makes NORMAL sync crash-safe without an fsync per commit.
+            conn.execute("PRAGMA synchronous=NORMAL;")
+            conn.execute("PRAGMA temp_store=MEMORY;")
+            conn.execute("PRAGMA cache_size=-65536;")  # 64 MiB
+            conn.execute("PRAGMA mmap_size=268435456;")  # 256 MiB
+            conn.execute("PRAGMA busy_timeout=5000;")
+            conn.execute("PRAGMA wal_autocheckpoint=1000;")
+            conn.execute("PRAGMA foreign_keys=ON;")
+
+    @contextmanager
+    def _reader(self) -> Iterator[sqlite3.Connection]:
+        conn = self._read_pool.get()
+        try:
+            yield conn
+        finally:
+            self._read_pool.put(conn)
 
     def _init_schema(self) -> None:
         with self._conn:
@@ -98,10 +302,32 @@ class SessionStore:
                     created_at TEXT NOT NULL,
                     updated_at TEXT NOT NULL,
                     expires_at TEXT NOT NULL,
-                    metadata TEXT DEFAULT '{}'
+                    metadata TEXT DEFAULT '{}',
+                    event_count INTEGER NOT NULL DEFAULT 0
                 )
                 """
             )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_sessions_expires ON sessions(expires_at)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_sessions_user_updated "
+                "ON sessions(user_id, updated_at DESC)"
+            )
+            columns = {
+                row["name"] for row in self._conn.execute("PRAGMA table_info(sessions)")
+            }
+            if "event_count" not in columns:
+                self._conn.execute(
+                    "ALTER TABLE sessions ADD COLUMN event_count INTEGER NOT NULL DEFAULT 0"
+                )
+                self._conn.execute(
+                    """
+                    UPDATE sessions SET event_count = (
+                        SELECT COUNT(*) FROM events WHERE events.session_id = sessions.session_id
+                    )
+                    """
+                )
             self._conn.execute(
                 """
                 CREATE TABLE IF NOT EXISTS events (
@@ -110,7 +336,7 @@ class SessionStore:
                     sequence INTEGER NOT NULL,
                     role TEXT NOT NULL,
                     content TEXT NOT NULL,
-                    payload TEXT DEFAULT '{}',
+                    payload BLOB DEFAULT '{}',
                     created_at TEXT NOT NULL,
                     FOREIGN KEY(session_id) REFERENCES sessions(session_id)
                         ON DELETE CASCADE,
@@ -132,10 +358,16 @@ class SessionStore:
                 )
                 """
             )
+            # UNIQUE(session_id, sequence) already yields the ordered index used
+            # by replay, MAX(sequence) and COUNT(*); refresh planner stats so it
+            # keeps being chosen as tables grow. analysis_limit bounds the cost.
+            self._conn.execute("PRAGMA analysis_limit=400;")
+            self._conn.execute("ANALYZE;")
 
     # ------------------------------------------------------------------ #
     # public API
     # ------------------------------------------------------------------ #
+    @_on_db_thread
     def start_session(
         self,
         *,
@@ -149,36 +381,26 @@ class SessionStore:
         if not session_id:
             session_id = str(uuid.uuid4())
         ttl = max(1, int(ttl_hours or self.default_ttl))
-        now = _utc_now()
-        expires_at = now + timedelta(hours=ttl)
         metadata_json = json.dumps(metadata or {}, ensure_ascii=False)
 
         with self._lock, self._conn:
-            existing = self._conn.execute(
-                "SELECT user_id FROM sessions WHERE session_id = ?",
-                (session_id,),
-            ).fetchone()
-            if existing:
-                if existing["user_id"] != user_id:
-                    raise ValueError("Session belongs to a different user")
-                self._conn.execute(
-                    """
-                    UPDATE sessions
-                    SET updated_at = ?, expires_at = ?, metadata = COALESCE(?, metadata)
-                    WHERE session_id = ?
-                    """,
-                    (_iso(now), _iso(expires_at), metadata_json, session_id),
-                )
-            else:
-                self._conn.execute(
-                    """
-                    INSERT INTO sessions (session_id, user_id, created_at, updated_at, expires_at, metadata)
-                    VALUES (?, ?, ?, ?, ?, ?)
-                    """,
-                    (session_id, user_id, _iso(now), _iso(now), _iso(expires_at), metadata_json),
-                )
+            self._upsert_session(session_id, user_id, ttl, metadata_json)
         return session_id
 
+    def _upsert_session(
+        self, session_id: str, user_id: str, ttl: int, metadata_json: str
+    ) -> None:
+        # Caller holds _lock and owns the transaction; _lock is not reentrant.
+        now = _utc_now()
+        expires_at = now + timedelta(hours=ttl)
+        cur = self._conn.execute(
+            _SQL_UPSERT_SESSION,
+            (session_id, user_id, _iso(now), _iso(now), _iso(expires_at), metadata_json),
+        )
+        if cur.rowcount == 0:
+            raise ValueError("Session belongs to a different user")
+
+    @_on_db_thread
     def append_event(
         self,
         *,
@@ -196,59 +418,220 @@ class SessionStore:
 
         payload = payload or {}
         event = SessionEvent(role=role, content=content, payload=payload)
+        # Encode before taking the lock so concurrent writers only serialize
+        # on the INSERT itself.
+        payload_blob = _dump_payload(payload)
+
+        if self.buffered:
+            self._enqueue(user_id, session_id, event, payload_blob)
+            return event
+
+        with self._lock:
+            with self._conn:
+                owner = self._conn.execute(_SQL_SESSION_OWNER, (session_id,)).fetchone()
+                if not owner:
+                    # Implicitly create the session if it does not exist.
+                    self._upsert_session(session_id, user_id, self.default_ttl, "{}")
+                elif owner["user_id"] != user_id:
+                    raise ValueError("User is not allowed to append to this session")
+
+                # Touch the session row first so the write transaction is
+                # already open when the next sequence is read.
+                if self.extend_ttl_on_write:
+                    expires_at = _iso(_utc_now() + timedelta(hours=self.default_ttl))
+                    self._conn.execute(
+                        _SQL_TOUCH_SESSION,
+                        (event.created_at, expires_at, 1, session_id),
+                    )
+                else:
+                    self._conn.execute(_SQL_BUMP_EVENT_COUNT, (1, session_id))
+
+                if _HAS_RETURNING:
+                    event.sequence = self._conn.execute(
+                        _SQL_INSERT_EVENT_RETURNING,
+                        (
+                            session_id,
+                            event.role,
+                            event.content,
+                            payload_blob,
+                            event.created_at,
+                        ),
+                    ).fetchone()["sequence"]
+                else:
+                    last_seq = self._conn.execute(
+                        _SQL_LAST_SEQUENCE, (session_id,)
+                    ).fetchone()["seq"]
+                    event.sequence = last_seq + 1
+                    self._conn.execute(
+                        _SQL_INSERT_EVENT,
+                        (
+                            session_id,
+                            event.sequence,
+                            event.role,
+                            event.content,
+                            payload_blob,
+                            event.created_at,
+                        ),
+                    )
+        return event
 
-        with self._lock, self._conn:
-            owner = self._conn.execute(
-                "SELECT user_id FROM sessions WHERE session_id = ?",
-                (session_id,),
-            ).fetchone()
-            if not owner:
-                # Implicitly create the session if it does not exist.
-                self.start_session(user_id=user_id, session_id=session_id)
-            elif owner["user_id"] != user_id:
-                raise ValueError("User is not allowed to append to this session")
-
-            next_seq = self._conn.execute(
-                "SELECT COALESCE(MAX(sequence), 0) + 1 AS seq FROM events WHERE session_id = ?",
-                (session_id,),
-            ).fetchone()["seq"]
+    @_on_db_thread
+    def append_events_bulk(
+        self,
+        *,
+        user_id: str,
+        session_id: str,
+        events: List[Tuple[str, str, Optional[Dict[str, Any]]]],
+    ) -> List[SessionEvent]:
+        """Append several (role, content, payload) events in one transaction."""
+        session_id = session_id.strip()
+        user_id = self._sanitize_user_id(user_id)
+        if not session_id:
+            raise ValueError("session_id is required")
+        if not events:
+            return []
 
-            event.sequence = next_seq
-            self._conn.execute(
-                """
-                INSERT INTO events (session_id, sequence, role, content, payload, created_at)
-                VALUES (?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    session_id,
-                    event.sequence,
-                    event.role,
-                    event.content,
-                    json.dumps(event.payload, ensure_ascii=False),
-                    event.created_at,
-                ),
-            )
+        batch = [
+            SessionEvent(role=role, content=content, payload=payload or {})
+            for role, content, payload in events
+        ]
+        payload_blobs = [_dump_payload(event.payload) for event in batch]
+        self._write_batch(user_id, session_id, batch, payload_blobs)
+        return batch
 
-            if self.extend_ttl_on_write:
-                expires_at = _iso(_utc_now() + timedelta(hours=self.default_ttl))
-                self._conn.execute(
-                    """
-                    UPDATE sessions
-                    SET updated_at = ?, expires_at = ?
-                    WHERE session_id = ?
-                    """,
-                    (event.created_at, expires_at, session_id),
+    def _write_batch(
+        self,
+        user_id: str,
+        session_id: str,
+        batch: List[SessionEvent],
+        payload_blobs: List[bytes],
+    ) -> None:
+        with self._lock:
+            with self._conn:
+                owner = self._conn.execute(_SQL_SESSION_OWNER, (session_id,)).fetchone()
+                if not owner:
+                    self._upsert_session(session_id, user_id, self.default_ttl, "{}")
+                elif owner["user_id"] != user_id:
+                    raise ValueError("User is not allowed to append to this session")
+
+                # Update the session row first: that opens the write
+                # transaction, so the MAX(sequence) read below cannot be
+                # overtaken by another connection before the INSERTs land.
+                if self.extend_ttl_on_write:
+                    expires_at = _iso(_utc_now() + timedelta(hours=self.default_ttl))
+                    self._conn.execute(
+                        _SQL_TOUCH_SESSION,
+                        (batch[-1].created_at, expires_at, len(batch), session_id),
+                    )
+                else:
+                    self._conn.execute(_SQL_BUMP_EVENT_COUNT, (len(batch), session_id))
+
+                last_seq = self._conn.execute(
+                    _SQL_LAST_SEQUENCE, (session_id,)
+                ).fetchone()["seq"]
+                for offset, event in enumerate(batch, start=1):
+                    event.sequence = last_seq + offset
+
+                self._conn.executemany(
+                    _SQL_INSERT_EVENT,
+                    [
+                        (
+                            session_id,
+                            event.sequence,
+                            event.role,
+                            event.content,
+                            blob,
+                            event.created_at,
+                        )
+                        for event, blob in zip(batch, payload_blobs)
+                    ],
                 )
-        return event
 
+    def _enqueue(
+        self, user_id: str, session_id: str, event: SessionEvent, payload_blob: bytes
+    ) -> None:
+        # Authorize at enqueue time, like the unbuffered path, so the caller
+        # sees the ValueError instead of the flush silently dropping events.
+        with self._reader() as conn:
+            owner = conn.execute(_SQL_SESSION_OWNER, (session_id,)).fetchone()
+        with self._pending_lock:
+            owner_id = owner["user_id"] if owner else self._pending_owners.get(session_id)
+            if owner_id is not None and owner_id != user_id:
+                raise ValueError("User is not allowed to append to this session")
+            if owner is None:
+                self._pending_owners[session_id] = user_id
+            self._pending.append((user_id, session_id, event, payload_blob))
+            flush_now = len(self._pending) >= self.flush_batch_size
+            if not flush_now:
+                self._arm_flush_timer()
+        if flush_now:
+            self.flush()
+
+    def _arm_flush_timer(self) -> None:
+        """Start the deferred flush if none is scheduled; caller holds _pending_lock."""
+        if self._flush_timer is None:
+            self._flush_timer = threading.Timer(self.flush_interval, self.flush)
+            self._flush_timer.daemon = True
+            self._flush_timer.start()
+
+    @_on_db_thread
+    def flush(self) -> int:
+        """Write all buffered events; returns how many were persisted."""
+        # Serialize flushes so a timer flush and a batch-size flush cannot
+        # commit their drained events out of order.
+        with self._flush_lock:
+            with self._pending_lock:
+                if self._flush_timer is not None:
+                    self._flush_timer.cancel()
+                    self._flush_timer = None
+                pending = list(self._pending)
+                self._pending.clear()
+                self._pending_owners.clear()
+            if not pending:
+                return 0
+
+            # Group per (user, session) in arrival order; one transaction each.
+            groups: Dict[Tuple[str, str], Tuple[List[SessionEvent], List[bytes]]] = {}
+            for user_id, session_id, event, blob in pending:
+                events, blobs = groups.setdefault((user_id, session_id), ([], []))
+                events.append(event)
+                blobs.append(blob)
+
+            written = 0
+            items = list(groups.items())
+            for index, ((user_id, session_id), (events, blobs)) in enumerate(items):
+                try:
+                    self._write_batch(user_id, session_id, events, blobs)
+                    written += len(events)
+                except ValueError as exc:
+                    # Ownership was checked on enqueue, so this only happens
+                    # if the session changed hands in between; never writable.
+                    logger.error(
+                        f"Dropping {len(events)} buffered events for session {session_id}: {exc}"
+                    )
+                except sqlite3.Error:
+                    # Put this group and every unwritten one back at the front
+                    # of the buffer (ahead of newer events) and retry later.
+                    requeue = [
+                        (uid, sid, event, blob)
+                        for (uid, sid), (group_events, group_blobs) in items[index:]
+                        for event, blob in zip(group_events, group_blobs)
+                    ]
+                    with self._pending_lock:
+                        self._pending.extendleft(reversed(requeue))
+                        for uid, sid, _, _ in requeue:
+                            self._pending_owners.setdefault(sid, uid)
+                        self._arm_flush_timer()
+                    raise
+            return written
+
+    @_on_db_thread
     def count_events(self, session_id: str) -> int:
-        with self._lock, self._conn:
-            row = self._conn.execute(
-                "SELECT COUNT(*) AS cnt FROM events WHERE session_id = ?",
-                (session_id,),
-            ).fetchone()
-            return int(row["cnt"])
+        with self._reader() as conn:
+            row = conn.execute(_SQL_EVENT_COUNT, (session_id,)).fetchone()
+        return int(row["event_count"]) if row else 0
 
+    @_on_db_thread
     def get_session(
         self,
         *,
@@ -258,8 +641,8 @@ class SessionStore:
     ) -> Dict[str, Any]:
         """Return session metadata plus ordered events."""
         user_id = self._sanitize_user_id(user_id)
-        with self._lock, self._conn:
-            session_row = self._conn.execute(
+        with self._reader() as conn:
+            session_row = conn.execute(
                 "SELECT * FROM sessions WHERE session_id = ?",
                 (session_id,),
             ).fetchone()
@@ -268,24 +651,15 @@ class SessionStore:
             if session_row["user_id"] != user_id:
                 raise ValueError("User is not allowed to read this session")
 
-            query = "SELECT * FROM events WHERE session_id = ? ORDER BY sequence ASC"
+            query = _SQL_EVENTS_FROM
             params: Tuple[Any, ...]
-            params = (session_id,)
+            params = (session_id, 0)
             if limit:
                 query += " LIMIT ?"
-                params = (session_id, int(limit))
-            event_rows = self._conn.execute(query, params).fetchall()
+                params = (session_id, 0, int(limit))
+            event_rows = conn.execute(query, params).fetchall()
 
-        events = [
-            {
-                "sequence": row["sequence"],
-                "role": row["role"],
-                "content": row["content"],
-                "payload": json.loads(row["payload"] or "{}"),
-                "created_at": row["created_at"],
-            }
-            for row in event_rows
-        ]
+        events = [_event_dict(row) for row in event_rows]
 
         return {
             "session_id": session_row["session_id"],
@@ -297,16 +671,17 @@ class SessionStore:
             "events": events,
         }
 
+    @_on_db_thread
     def list_sessions(self, user_id: Optional[str] = None) -> List[Dict[str, Any]]:
         """List sessions optionally filtered by user."""
-        with self._lock, self._conn:
+        with self._reader() as conn:
             if user_id:
-                rows = self._conn.execute(
+                rows = conn.execute(
                     "SELECT * FROM sessions WHERE user_id = ? ORDER BY updated_at DESC",
                     (self._sanitize_user_id(user_id),),
                 ).fetchall()
             else:
-                rows = self._conn.execute(
+                rows = conn.execute(
                     "SELECT * FROM sessions ORDER BY updated_at DESC"
                 ).fetchall()
         return [
@@ -319,22 +694,41 @@ class SessionStore:
             for row in rows
         ]
 
+    @_on_db_thread
     def purge_expired_sessions(self, batch_size: int = 100) -> int:
         """Remove expired sessions to keep storage bounded."""
         now_iso = _iso(_utc_now())
         with self._lock, self._conn:
-            rows = self._conn.execute(
-                "SELECT session_id FROM sessions WHERE expires_at < ? LIMIT ?",
+            # ON DELETE CASCADE removes the events and compaction chunks.
+            cur = self._conn.execute(
+                """
+                DELETE FROM sessions
+                WHERE session_id IN (
+                    SELECT session_id FROM sessions
+                    WHERE expires_at < ?
+                    ORDER BY expires_at
+                    LIMIT ?
+                )
+                """,
                 (now_iso, batch_size),
-            ).fetchall()
-            ids = [row["session_id"] for row in rows]
-            if not ids:
-                return 0
-            self._conn.executemany(
-                "DELETE FROM sessions WHERE session_id = ?", ((sid,) for sid in ids)
             )
-        return len(ids)
-
+            self._purge_calls += 1
+            due = self._purge_calls % MAINTENANCE_EVERY_N_PURGES == 0
+        if due:
+            self.run_maintenance()
+        return cur.rowcount
+
+    @_on_db_thread
+    def run_maintenance(self, vacuum: bool = False) -> None:
+        """Checkpoint the WAL, refresh planner stats and optionally VACUUM."""
+        with self._lock:
+            self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE);")
+            self._conn.execute("PRAGMA optimize;")
+            if vacuum:
+                # VACUUM cannot run inside a transaction, so no `with conn`.
+                self._conn.execute("VACUUM;")
+
+    @_on_db_thread
     def record_compaction_chunk(
         self,
         session_id: str,
@@ -358,6 +752,7 @@ class SessionStore:
                 ),
             )
 
+    @_on_db_thread
     def delete_event_range(
         self,
         session_id: str,
@@ -374,13 +769,16 @@ class SessionStore:
                 """,
                 (session_id, start_sequence, end_sequence),
             )
+            if cur.rowcount:
+                self._conn.execute(_SQL_BUMP_EVENT_COUNT, (-cur.rowcount, session_id))
             return cur.rowcount
 
+    @_on_db_thread
     def get_oldest_events(
         self, session_id: str, window: int
     ) -> List[Dict[str, Any]]:
-        with self._lock, self._conn:
-            rows = self._conn.execute(
+        with self._reader() as conn:
+            rows = conn.execute(
                 """
                 SELECT sequence, role, content, payload, created_at
                 FROM events
@@ -390,16 +788,64 @@ class SessionStore:
                 """,
                 (session_id, int(window)),
             ).fetchall()
-        return [
-            {
-                "sequence": row["sequence"],
-                "role": row["role"],
-                "content": row["content"],
-                "payload": json.loads(row["payload"] or "{}"),
-                "created_at": row["created_at"],
-            }
-            for row in rows
-        ]
+        return [_event_dict(row) for row in rows]
+
+    def iter_events(
+        self,
+        *,
+        user_id: str,
+        session_id: str,
+        start_seq: int = 0,
+    ) -> Iterator[Dict[str, Any]]:
+        """Lazily yield events after ``start_seq`` without materializing the log."""
+        user_id = self._sanitize_user_id(user_id)
+        # Check ownership now rather than on the first next().
+        self._check_read_access(user_id, session_id)
+        return self._iter_event_batches(session_id, int(start_seq))
+
+    def _iter_event_batches(self, session_id: str, start_seq: int) -> Iterator[Dict[str, Any]]:
+        # Borrow a reader per batch and resume from the last sequence, so a
+        # paused iterator never holds a pooled connection (or the DB thread).
+        last_seq = start_seq
+        while True:
+            events = self._fetch_events_from(session_id, last_seq, _ITER_FETCH_SIZE)
+            yield from events
+            if len(events) < _ITER_FETCH_SIZE:
+                return
+            last_seq = events[-1]["sequence"]
+
+    @_on_db_thread
+    def _check_read_access(self, user_id: str, session_id: str) -> None:
+        with self._reader() as conn:
+            owner = conn.execute(_SQL_SESSION_OWNER, (session_id,)).fetchone()
+        if not owner:
+            raise KeyError("Session not found")
+        if owner["user_id"] != user_id:
+            raise ValueError("User is not allowed to read this session")
+
+    @_on_db_thread
+    def _fetch_events_from(
+        self, session_id: str, start_seq: int, limit: int
+    ) -> List[Dict[str, Any]]:
+        with self._reader() as conn:
+            rows = conn.execute(
+                _SQL_EVENTS_FROM + " LIMIT ?", (session_id, start_seq, limit)
+            ).fetchall()
+        return [_event_dict(row) for row in rows]
+
+    @_on_db_thread
+    def close(self) -> None:
+        """Flush buffered events, then close all connections."""
+        self.flush()
+        with self._lock:
+            self._conn.close()
+        while True:
+            try:
+                self._read_pool.get_nowait().close()
+            except queue.Empty:
+                break
+        if self._db_executor is not None:
+            self._db_executor.shutdown(wait=False)
 
     # ------------------------------------------------------------------ #
     # helpers
@@ -408,10 +854,68 @@ class SessionStore:
     def _sanitize_user_id(user_id: str) -> str:
         if not user_id:
             return "anonymous"
-        safe = "".join(ch for ch in user_id if ch.isalnum() or ch in {"-", "_", "@"})
+        if user_id.isascii():
+            safe = user_id.translate(_USER_ID_ASCII_STRIP)
+        else:
+            # Keep accepting Unicode alphanumerics, which a byte table can't express.
+            safe = "".join(
+                ch for ch in user_id if ch.isalnum() or ch in _USER_ID_EXTRA_CHARS
+            )
         return safe or "anonymous"
 
 
+class AsyncSessionStore:
+    """
+    Asyncio facade over :class:`SessionStore`.
+
+    SQLite calls block (fsync, WAL checkpoints), so every operation is run
+    off the event loop: writes on a single dedicated thread, matching the
+    single writer connection, and reads on a small pool matching the
+    store's reader connections.
+    """
+
+    def __init__(self, store: Optional[SessionStore] = None, read_workers: int = DEFAULT_READ_POOL_SIZE):
+        self.store = store or SessionStore()
+        self._writer_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="session-writer")
+        self._reader_pool = ThreadPoolExecutor(
+            max_workers=max(1, int(read_workers)), thread_name_prefix="session-reader"
+        )
+
+    async def _run(self, pool: ThreadPoolExecutor, fn, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(pool, functools.partial(fn, *args, **kwargs))
+
+    async def start_session(self, **kwargs) -> str:
+        return await self._run(self._writer_pool, self.store.start_session, **kwargs)
+
+    async def append_event(self, **kwargs) -> SessionEvent:
+        return await self._run(self._writer_pool, self.store.append_event, **kwargs)
+
+    async def append_events_bulk(self, **kwargs) -> List[SessionEvent]:
+        return await self._run(self._writer_pool, self.store.append_events_bulk, **kwargs)
+
+    async def purge_expired_sessions(self, batch_size: int = 100) -> int:
+        return await self._run(self._writer_pool, self.store.purge_expired_sessions, batch_size)
+
+    async def get_session(self, **kwargs) -> Dict[str, Any]:
+        return await self._run(self._reader_pool, self.store.get_session, **kwargs)
+
+    async def list_sessions(self, user_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        return await self._run(self._reader_pool, self.store.list_sessions, user_id)
+
+    async def count_events(self, session_id: str) -> int:
+        return await self._run(self._reader_pool, self.store.count_events, session_id)
+
+    async def close(self) -> None:
+        """Drain pending work, then close the underlying store."""
+        await asyncio.to_thread(self._shutdown)
+
+    def _shutdown(self) -> None:
+        self._writer_pool.shutdown(wait=True)
+        self._reader_pool.shutdown(wait=True)
+        self.store.close()
+
+
 class SessionCompactor:
     """
     Simple deterministic compactor.
@@ -464,15 +968,21 @@ class SessionCompactor:
     def _summarize(events: List[Dict[str, Any]]) -> str:
         """Create a deterministic summary from a block of events."""
         parts = []
+        size = -3  # no " | " before the first part
         for event in events:
             content_preview = event["content"].strip().replace("\n", " ")
             if len(content_preview) > 120:
                 content_preview = content_preview[:117] + "..."
-            parts.append(f"{event['role']}: {content_preview}")
+            part = f"{event['role']}: {content_preview}"
+            parts.append(part)
+            size += len(part) + 3
+            if size > 900:
+                # Already past the cap; later events would be sliced off anyway.
+                break
         joined = " | ".join(parts)
         if len(joined) > 900:
             joined = joined[:897] + "..."
         return joined
 
 
-__all__ = ["SessionStore", "SessionCompactor", "SessionEvent"]
+__all__ = ["SessionStore", "AsyncSessionStore", "SessionCompactor", "SessionEvent"]
@@ -0,0 +1,81 @@
+"""
+Unit tests for SafePyAutoGUIExecutor validation.
+
+Tests cover:
+- Deeply nested expressions (no RecursionError escaping validation)
+- Single-pass traversal reporting the first violation in source order
+- Fast-path regex deferring non-ASCII input to the full parse
+"""
+
+from types import SimpleNamespace
+
+from infrastructure.safe_pyautogui_executor import SafePyAutoGUIExecutor
+
+
+# ============================================================================
+# Validation Tests
+# ============================================================================
+
+def test_deeply_nested_expression_is_validated():
+    """Test that deep ASTs are walked without hitting the recursion limit."""
+    executor = SafePyAutoGUIExecutor()
+
+    for terms in (500, 1000, 2000):
+        code = "pyautogui.click(" + "+".join(["1"] * terms) + ")"
+        result = executor.validate_action_code(code)
+        assert result.is_safe, (terms, result.error)
+
+
+def test_deeply_nested_violation_is_rejected():
+    """Test that a blocked call at the bottom of a deep expression is still found."""
+    executor = SafePyAutoGUIExecutor()
+
+    code = "pyautogui.click(" + "+".join(["1"] * 2000) + "+other.call())"
+    result = executor.validate_action_code(code)
+    assert not result.is_safe
+    assert "other.call()" in result.error
+
+
+def test_pathologically_nested_code_is_rejected_not_raised():
+    """Test that input the parser cannot handle is rejected instead of raising."""
+    executor = SafePyAutoGUIExecutor()
+
+    code = "pyautogui.click(" + "+".join(["1"] * 50000) + ")"
+    result = executor.validate_action_code(code)
+    assert not result.is_safe
+
+
+def test_first_violation_in_source_order_is_reported():
+    """Test that the walk stops at the earliest violation, in source order."""
+    executor = SafePyAutoGUIExecutor()
+
+    result = executor.validate_action_code(
+        "pyautogui.click(first.call())\npyautogui.badfn()"
+    )
+    assert not result.is_safe
+    assert "first.call()" in result.error
+
+
+def test_execute_deeply_nested_action():
+    """Test that execute() runs deep-but-valid code instead of raising."""
+    executor = SafePyAutoGUIExecutor(timeout_seconds=5)
+    clicks = []
+    fake_pyautogui = SimpleNamespace(click=lambda *args: clicks.append(args))
+
+    code = "pyautogui.click(" + "+".join(["1"] * 1000) + ")"
+    success, error = executor.execute(code, fake_pyautogui)
+    assert success, error
+    assert clicks == [(1000,)]
+
+
+def test_non_ascii_argument_is_not_fast_pathed():
+    """Test that non-identifier Unicode in arguments is rejected like ast.parse does."""
+    executor = SafePyAutoGUIExecutor()
+
+    for code in ("pyautogui.click(a\u00b2)", "pyautogui.click(1\u0661)", "pyautogui.click(1,\u00a02)"):
+        result = executor.validate_action_code(code)
+        assert not result.is_safe, code
+        assert result.error.startswith("Syntax error"), result.error
+
+    # Non-ASCII inside a string literal is still valid code
+    assert executor.validate_action_code("pyautogui.write('caf\u00e9')").is_safe
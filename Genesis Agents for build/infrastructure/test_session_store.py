@@ -0,0 +1,113 @@
+"""
+Unit tests for SessionStore persistence.
+
+Tests cover:
+- Payloads holding NaN/Infinity (legacy rows and new writes)
+- iter_events batching, reader release and ownership checks
+"""
+
+import math
+
+import pytest
+
+from infrastructure import session_store as session_store_module
+from infrastructure.session_store import SessionStore
+
+
+# ============================================================================
+# Payload Encoding Tests
+# ============================================================================
+
+def test_legacy_row_with_nan_is_readable(tmp_path):
+    """Test that TEXT payloads written by json.dumps with NaN still load."""
+    store = SessionStore(db_path=tmp_path / "sessions.db")
+    try:
+        store.append_event(user_id="u1", session_id="s1", role="user", content="hi")
+        with store._conn:
+            store._conn.execute(
+                "INSERT INTO events (session_id, sequence, role, content, payload, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                ("s1", 2, "user", "legacy", '{"score": NaN, "cap": Infinity}', "2024-01-01T00:00:00"),
+            )
+
+        events = store.get_session(user_id="u1", session_id="s1")["events"]
+        payload = events[1]["payload"]
+        assert math.isnan(payload["score"])
+        assert payload["cap"] == math.inf
+    finally:
+        store.close()
+
+
+def test_non_finite_payload_round_trips(tmp_path):
+    """Test that NaN/Infinity are stored as such rather than collapsed to null."""
+    store = SessionStore(db_path=tmp_path / "sessions.db")
+    try:
+        store.append_event(
+            user_id="u1",
+            session_id="s1",
+            role="tool",
+            content="result",
+            payload={"nested": [{"loss": float("nan")}], "best": float("-inf"), "none": None},
+        )
+
+        payload = store.get_session(user_id="u1", session_id="s1")["events"][0]["payload"]
+        assert math.isnan(payload["nested"][0]["loss"])
+        assert payload["best"] == -math.inf
+        assert payload["none"] is None
+    finally:
+        store.close()
+
+
+# ============================================================================
+# iter_events Tests
+# ============================================================================
+
+def test_iter_events_spans_batches(tmp_path):
+    """Test that iteration resumes across fetch batches without gaps or repeats."""
+    store = SessionStore(db_path=tmp_path / "sessions.db")
+    try:
+        total = session_store_module._ITER_FETCH_SIZE * 2 + 3
+        store.append_events_bulk(
+            user_id="u1",
+            session_id="s1",
+            events=[("user", str(i), None) for i in range(total)],
+        )
+
+        events = list(store.iter_events(user_id="u1", session_id="s1"))
+        assert [e["sequence"] for e in events] == list(range(1, total + 1))
+
+        tail = list(store.iter_events(user_id="u1", session_id="s1", start_seq=total - 2))
+        assert [e["sequence"] for e in tail] == [total - 1, total]
+    finally:
+        store.close()
+
+
+def test_iter_events_does_not_hold_reader(tmp_path):
+    """Test that reads issued mid-iteration do not block with a one-reader pool."""
+    store = SessionStore(db_path=tmp_path / "sessions.db", read_pool_size=1)
+    try:
+        for i in range(3):
+            store.append_event(user_id="u1", session_id="s1", role="user", content=str(i))
+
+        seen = []
+        for event in store.iter_events(user_id="u1", session_id="s1"):
+            seen.append(event["sequence"])
+            # Would wait forever on the pool if the iterator kept the reader.
+            assert store.count_events("s1") == 3
+        assert seen == [1, 2, 3]
+    finally:
+        store.close()
+
+
+def test_iter_events_checks_owner(tmp_path):
+    """Test that iter_events applies the same access checks as get_session."""
+    store = SessionStore(db_path=tmp_path / "sessions.db")
+    try:
+        store.append_event(user_id="u1", session_id="s1", role="user", content="hi")
+
+        with pytest.raises(ValueError):
+            store.iter_events(user_id="u2", session_id="s1")
+        with pytest.raises(KeyError):
+            store.iter_events(user_id="u1", session_id="missing")
+    finally:
+        store.close()
@@ -13,13 +13,20 @@ Integration: DeepEyesV2 Phase 2
 """
 
 import asyncio
+import hashlib
 import json
 import logging
 import time
+from collections import Counter
+from itertools import islice, repeat
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Tuple
-import hashlib
+from typing import Dict, Iterable, List, Optional, Any, Tuple
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
 
 from infrastructure.load_env import load_genesis_env
 
@@ -27,8 +34,47 @@ load_genesis_env()
 
 logger = logging.getLogger(__name__)
 
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so existing
+# except clauses keep working with either parser.
+_loads = orjson.loads if orjson is not None else json.loads
+
+# Byte patterns for a successful invocation as written by json.dumps (default
+# or compact separators). Used to reject failed lines before parsing.
+_SUCCESS_MARKERS = (b'"success": true', b'"success":true')
+
+
+def _canonical_params(parameters: Dict[str, Any]) -> Any:
+    """Key-order-independent encoding of parameters for deduplication."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(
+                parameters, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS
+            )
+        except TypeError:
+            pass
+    return json.dumps(parameters, sort_keys=True)
+
+
+def _digest_key(key: Tuple[str, str, Any]) -> bytes:
+    """Fixed-size digest of a dedup key, so streaming memory does not scale with payload size."""
+    h = hashlib.blake2b(digest_size=16)
+    for part in key:
+        if isinstance(part, str):
+            part = part.encode("utf-8")
+        # Length-prefix each field so ("ab", "c") and ("a", "bc") differ.
+        h.update(len(part).to_bytes(8, "little"))
+        h.update(part)
+    return h.digest()
+
+
+def _encode_line(record: Dict[str, Any]) -> bytes:
+    """Encode one training record as a newline-terminated JSONL row."""
+    if orjson is not None:
+        return orjson.dumps(record, option=orjson.OPT_APPEND_NEWLINE)
+    return (json.dumps(record) + "\n").encode("utf-8")
 
-@dataclass
+
+@dataclass(slots=True)
 class ToolInvocationExample:
     """A training example for tool selection"""
     task_description: str
@@ -69,19 +115,42 @@ class ColdStartSFTDataset:
     - Stratified sampling by tool type
     - Train/val/test split
     - Format conversion for various training frameworks
+    - Optional streaming mode that writes examples straight to disk
     """
 
-    def __init__(self, data_dir: str = "data/tool_reliability"):
+    def __init__(
+        self,
+        data_dir: str = "data/tool_reliability",
+        streaming: bool = False,
+        stream_filename: str = "sft_dataset.jsonl",
+    ):
         """
         Initialize SFT dataset.
 
         Args:
             data_dir: Directory for storing training data
+            streaming: Append examples to disk as they are added instead of
+                keeping them in memory (only a 16-byte dedup digest per unique
+                example and the stats are retained)
+            stream_filename: Output file used in streaming mode
         """
         self.data_dir = Path(data_dir)
         self.data_dir.mkdir(parents=True, exist_ok=True)
         self.examples: List[ToolInvocationExample] = []
-        self.example_hashes: set = set()  # For deduplication
+        # Dedup keys: (task_description, tool_name, canonical parameters),
+        # or a blake2b digest of that tuple in streaming mode
+        self.example_hashes: set = set()
+
+        # Incremental statistics, valid in both modes
+        self._total = 0
+        self._successes = 0
+        self._tool_counts: Counter = Counter()
+        self._agent_counts: Counter = Counter()
+
+        self.streaming = streaming
+        self._stream_path = self.data_dir / stream_filename
+        # Opened on the first streamed example; see add_example()
+        self._out_fh = None
 
         logger.info(f"ColdStartSFTDataset initialized: {self.data_dir}")
 
@@ -95,18 +164,30 @@ class ColdStartSFTDataset:
         Returns:
             True if added, False if duplicate
         """
-        # Create hash for deduplication
-        example_str = (
-            f"{example.task_description}|{example.tool_name}|"
-            f"{json.dumps(example.parameters, sort_keys=True)}"
+        key = (
+            example.task_description,
+            example.tool_name,
+            _canonical_params(example.parameters),
         )
-        example_hash = hashlib.md5(example_str.encode()).hexdigest()
-
-        if example_hash in self.example_hashes:
+        if self.streaming:
+            key = _digest_key(key)
+        if key in self.example_hashes:
             return False
 
-        self.examples.append(example)
-        self.example_hashes.add(example_hash)
+        if self.streaming:
+            if self._out_fh is None:
+                # The first example truncates any file left by an earlier
+                # run; after save_dataset()/close() keep appending to it.
+                self._out_fh = open(self._stream_path, "ab" if self._total else "wb")
+            self._out_fh.write(_encode_line(example.to_training_format()))
+        else:
+            self.examples.append(example)
+        self.example_hashes.add(key)
+
+        self._total += 1
+        self._successes += example.success
+        self._tool_counts[example.tool_name] += 1
+        self._agent_counts[example.agent_name] += 1
         return True
 
     async def load_from_invocations(
@@ -117,6 +198,9 @@ class ColdStartSFTDataset:
         """
         Load training examples from invocation logs.
 
+        Lines are pre-filtered on the raw bytes, so the log must encode the
+        flag as ``"success": true`` or ``"success":true`` (json.dumps output).
+
         Args:
             invocations_path: Path to invocations JSONL file
             min_success_rate: Only include if agent's success rate >= this
@@ -125,14 +209,20 @@ class ColdStartSFTDataset:
             Number of examples added
         """
         if not Path(invocations_path).exists():
-            logger.warning(f"Invocations file not found: {invocations_path}")
+            logger.warning("Invocations file not found: %s", invocations_path)
             return 0
 
         count = 0
-        with open(invocations_path, "r") as f:
+        with open(invocations_path, "rb") as f:
             for line in f:
+                # Failed invocations never contain a success marker, so skip
+                # them without parsing. A marker inside some other value only
+                # lets a line through to the real check below.
+                if _SUCCESS_MARKERS[0] not in line and _SUCCESS_MARKERS[1] not in line:
+                    continue
+
                 try:
-                    data = json.loads(line)
+                    data = _loads(line)
 
                     # Skip failed invocations for SFT dataset
                     if not data.get("success", False):
@@ -152,17 +242,20 @@ class ColdStartSFTDataset:
                         count += 1
 
                 except (json.JSONDecodeError, KeyError) as e:
-                    logger.warning(f"Failed to parse invocation: {e}")
+                    logger.warning("Failed to parse invocation: %s", e)
                     continue
 
-        logger.info(f"Loaded {count} unique training examples from {invocations_path}")
+        logger.info(
+            "Loaded %d unique training examples from %s", count, invocations_path
+        )
         return count
 
     def split_dataset(
         self,
         train_ratio: float = 0.8,
         val_ratio: float = 0.1,
-    ) -> Tuple[List[ToolInvocationExample], List[ToolInvocationExample], List[ToolInvocationExample]]:
+        lazy: bool = False,
+    ) -> Tuple[Iterable[ToolInvocationExample], Iterable[ToolInvocationExample], Iterable[ToolInvocationExample]]:
         """
         Split dataset into train/val/test.
 
@@ -170,14 +263,34 @@ class ColdStartSFTDataset:
             train_ratio: Fraction for training
             val_ratio: Fraction for validation
             (test uses remainder)
+            lazy: Return single-pass iterators over self.examples instead of
+                list copies (avoids duplicating references for large datasets)
 
         Returns:
-            Tuple of (train, val, test) example lists
+            Tuple of (train, val, test) example lists (iterators if lazy)
+
+        Raises:
+            ValueError: If the dataset is in streaming mode
         """
+        if self.streaming:
+            raise ValueError(
+                "split_dataset needs in-memory examples; split the streamed JSONL instead"
+            )
+
         n = len(self.examples)
         train_n = int(n * train_ratio)
         val_n = int(n * val_ratio)
 
+        if lazy:
+            logger.info(
+                f"Dataset split: {train_n} train, {val_n} val, {n - train_n - val_n} test"
+            )
+            return (
+                islice(self.examples, 0, train_n),
+                islice(self.examples, train_n, train_n + val_n),
+                islice(self.examples, train_n + val_n, None),
+            )
+
         train = self.examples[:train_n]
         val = self.examples[train_n : train_n + val_n]
         test = self.examples[train_n + val_n :]
@@ -200,13 +313,39 @@ class ColdStartSFTDataset:
         """
         output_path = self.data_dir / filename
 
-        with output_path.open("w") as f:
-            for example in self.examples:
-                f.write(json.dumps(example.to_training_format()) + "\n")
+        if self.streaming:
+            # Examples are already on disk; just close out the stream.
+            self.close()
+            if not self._total:
+                # Nothing was streamed, so don't pick up a stale file.
+                output_path.write_bytes(b"")
+            elif output_path != self._stream_path:
+                self._stream_path.replace(output_path)
+            self._stream_path = output_path
+            logger.info(f"Saved {self._total} examples to {output_path}")
+            return output_path
+
+        # Serialize everything up front and hand the file a single write.
+        output_path.write_bytes(
+            b"".join(_encode_line(example.to_training_format()) for example in self.examples)
+        )
 
         logger.info(f"Saved {len(self.examples)} examples to {output_path}")
         return output_path
 
+    def close(self) -> None:
+        """Close the streaming output file, if open (no-op otherwise)"""
+        if self._out_fh is not None:
+            self._out_fh.close()
+            self._out_fh = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+        return False
+
     def get_statistics(self) -> Dict[str, Any]:
         """
         Get dataset statistics.
@@ -214,20 +353,11 @@ class ColdStartSFTDataset:
         Returns:
             Dictionary with stats
         """
-        tools = {}
-        agents = {}
-
-        for example in self.examples:
-            tools[example.tool_name] = tools.get(example.tool_name, 0) + 1
-            agents[example.agent_name] = agents.get(example.agent_name, 0) + 1
-
         return {
-            "total_examples": len(self.examples),
-            "tools": tools,
-            "agents": agents,
-            "success_rate": sum(1 for e in self.examples if e.success) / len(self.examples)
-            if self.examples
-            else 0.0,
+            "total_examples": self._total,
+            "tools": dict(self._tool_counts),
+            "agents": dict(self._agent_counts),
+            "success_rate": self._successes / self._total if self._total else 0.0,
         }
 
 
@@ -265,6 +395,7 @@ class ColdStartSFT:
         self,
         output_dir: str = "models/tool_selector",
         data_dir: str = "data/tool_reliability",
+        streaming: bool = False,
     ):
         """
         Initialize cold-start SFT trainer.
@@ -272,14 +403,17 @@ class ColdStartSFT:
         Args:
             output_dir: Directory for trained models
             data_dir: Directory for training data
+            streaming: Build the dataset in streaming mode (memory grows only
+                by a small digest per unique example)
         """
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
         self.data_dir = Path(data_dir)
         self.data_dir.mkdir(parents=True, exist_ok=True)
 
-        self.dataset = ColdStartSFTDataset(str(self.data_dir))
-        self.training_history: List[Dict[str, Any]] = []
+        self.dataset = ColdStartSFTDataset(str(self.data_dir), streaming=streaming)
+        # (epoch, batch, loss, learning_rate) rows; dicts are built on demand
+        self._history: List[Tuple[int, int, float, float]] = []
 
         logger.info(f"ColdStartSFT initialized: output_dir={self.output_dir}")
 
@@ -349,46 +483,39 @@ class ColdStartSFT:
             logger.error(f"Dataset not found: {dataset_path}")
             raise FileNotFoundError(f"Dataset not found: {dataset_path}")
 
+        with open(dataset_path, "rb") as f:
+            if max_samples:
+                # Only the head is needed; don't pull the whole file in.
+                lines = list(islice(f, max_samples))
+            else:
+                # One read + C-level split instead of the per-line iterator.
+                lines = f.read().split(b"\n")
+
         examples = []
-        with open(dataset_path, "r") as f:
-            for i, line in enumerate(f):
-                if max_samples and i >= max_samples:
-                    break
-                try:
-                    examples.append(json.loads(line))
-                except json.JSONDecodeError:
-                    continue
+        for line in lines:
+            if not line.strip():
+                continue
+            try:
+                examples.append(_loads(line))
+            except json.JSONDecodeError:
+                continue
 
         logger.info(f"Loaded {len(examples)} training examples")
 
         # Simulate training process
         # In production: integrate with Unsloth pipeline
-        training_metrics = {
-            "epoch": 0,
-            "batch": 0,
-            "loss": 0.0,
-            "learning_rate": learning_rate,
-        }
 
         # Training loop (simulated)
         num_batches = (len(examples) + batch_size - 1) // batch_size
         for epoch in range(num_epochs):
-            epoch_loss = 0.0
-            for batch_idx in range(num_batches):
-                # Simulated training loss (should decrease)
-                batch_loss = 1.0 / (epoch + 1) / (batch_idx + 1)
-                epoch_loss += batch_loss
-
-                training_metrics = {
-                    "epoch": epoch,
-                    "batch": batch_idx,
-                    "loss": batch_loss,
-                    "learning_rate": learning_rate,
-                }
-
-                self.training_history.append(training_metrics)
-
-            avg_loss = epoch_loss / num_batches
+            # Simulated training loss (should decrease)
+            scale = 1.0 / (epoch + 1)
+            losses = [scale / (batch_idx + 1) for batch_idx in range(num_batches)]
+            self._history.extend(
+                zip(repeat(epoch), range(num_batches), losses, repeat(learning_rate))
+            )
+
+            avg_loss = sum(losses) / num_batches
             logger.info(f"Epoch {epoch + 1}/{num_epochs} - Loss: {avg_loss:.4f}")
 
         # Save training history
@@ -403,7 +530,7 @@ class ColdStartSFT:
             "num_epochs": num_epochs,
             "batch_size": batch_size,
             "learning_rate": learning_rate,
-            "final_loss": self.training_history[-1]["loss"] if self.training_history else 0.0,
+            "final_loss": self._history[-1][2] if self._history else 0.0,
         }
 
         checkpoint_path = output_path / "checkpoint.json"
@@ -436,7 +563,7 @@ class ColdStartSFT:
         with open(dataset_path, "r") as f:
             for line in f:
                 try:
-                    val_examples.append(json.loads(line))
+                    val_examples.append(_loads(line))
                 except json.JSONDecodeError:
                     continue
 
@@ -457,9 +584,17 @@ class ColdStartSFT:
         logger.info(f"Evaluation metrics: {json.dumps(metrics, indent=2)}")
         return metrics
 
+    @property
+    def training_history(self) -> List[Dict[str, Any]]:
+        """Per-batch training metrics, materialized from the compact rows"""
+        return [
+            {"epoch": epoch, "batch": batch, "loss": loss, "learning_rate": lr}
+            for epoch, batch, loss, lr in self._history
+        ]
+
     def get_training_history(self) -> List[Dict[str, Any]]:
         """Get training history"""
-        return self.training_history.copy()
+        return self.training_history
 
 
 # Global singleton
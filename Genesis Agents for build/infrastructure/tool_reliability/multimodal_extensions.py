@@ -15,12 +15,17 @@ import asyncio
 import json
 import logging
 import base64
-from dataclasses import dataclass, field, asdict
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Set
+from typing import Dict, List, Optional, Any, Set, Tuple
 from enum import Enum
 import time
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
 from infrastructure.load_env import load_genesis_env
 
 load_genesis_env()
@@ -38,12 +43,22 @@ class ImageToolType(Enum):
     VISUAL_REASONING = "visual_reasoning"
 
 
-@dataclass
+# Plain dict lookup is cheaper than the Enum.value descriptor on hot
+# serialization paths.
+_TOOL_TYPE_VALUE = {member: member.value for member in ImageToolType}
+
+
+@dataclass(slots=True)
 class ImageToolInvocation:
-    """An image-based tool invocation"""
+    """An image-based tool invocation
+
+    Prefer image_path so image data is streamed from disk; image_bytes holds
+    raw bytes only for in-memory images and is base64-encoded lazily in
+    to_dict() rather than kept inflated by 4/3 on every instance.
+    """
     tool_type: ImageToolType
     image_path: Optional[str] = None
-    image_base64: Optional[str] = None
+    image_bytes: Optional[bytes] = None
     query: str = ""
     success: bool = False
     extracted_text: Optional[str] = None
@@ -54,13 +69,27 @@ class ImageToolInvocation:
     metadata: Dict[str, Any] = field(default_factory=dict)
 
     def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary"""
-        data = asdict(self)
-        data["tool_type"] = self.tool_type.value
-        return data
+        """Convert to dictionary (shallow; asdict would deep-copy large results)"""
+        return {
+            "tool_type": _TOOL_TYPE_VALUE[self.tool_type],
+            "image_path": self.image_path,
+            "image_base64": (
+                base64.b64encode(self.image_bytes).decode("ascii")
+                if self.image_bytes
+                else None
+            ),
+            "query": self.query,
+            "success": self.success,
+            "extracted_text": self.extracted_text,
+            "analysis_result": self.analysis_result,
+            "confidence_score": self.confidence_score,
+            "latency_ms": self.latency_ms,
+            "error_message": self.error_message,
+            "metadata": self.metadata,
+        }
 
 
-@dataclass
+@dataclass(slots=True)
 class ToolChain:
     """A sequence of tools invoked together"""
     chain_id: str
@@ -119,10 +148,10 @@ class DeepSeekOCRClient:
         Returns:
             Dictionary with extracted text and metadata
         """
-        logger.info(f"Extracting text from: {image_path}")
+        logger.info("Extracting text from: %s", image_path)
 
         if not Path(image_path).exists():
-            logger.error(f"Image not found: {image_path}")
+            logger.error("Image not found: %s", image_path)
             return {
                 "success": False,
                 "error": f"Image not found: {image_path}",
@@ -139,13 +168,37 @@ class DeepSeekOCRClient:
             "processing_time_ms": 150.0,
         }
 
-        logger.info(f"Text extraction complete: {len(result['text'])} chars")
+        logger.info("Text extraction complete: %d chars", len(result["text"]))
         return result
 
+    async def extract_text_batch(
+        self,
+        image_paths: List[str],
+        concurrency: int = 8,
+    ) -> List[Dict[str, Any]]:
+        """
+        Extract text from several images concurrently.
+
+        Args:
+            image_paths: Paths to image files
+            concurrency: Maximum OCR requests in flight at once
+
+        Returns:
+            extract_text() results, in the same order as image_paths
+        """
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+
+        async def _extract(path: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.extract_text(path)
+
+        return await asyncio.gather(*(_extract(path) for path in image_paths))
+
     async def analyze_screenshot(
         self,
         image_path: str,
         analysis_type: str = "general",
+        text_result: Optional[Dict[str, Any]] = None,
     ) -> Dict[str, Any]:
         """
         Analyze screenshot for UI elements, text, structure.
@@ -153,6 +206,8 @@ class DeepSeekOCRClient:
         Args:
             image_path: Path to screenshot
             analysis_type: Type of analysis (general, ui_elements, text_only)
+            text_result: Prior extract_text() result for this image, if the
+                caller already ran OCR (skips a second OCR pass)
 
         Returns:
             Analysis result
@@ -160,7 +215,8 @@ class DeepSeekOCRClient:
         logger.info(f"Analyzing screenshot: {image_path}")
 
         # Extract text first
-        text_result = await self.extract_text(image_path)
+        if text_result is None:
+            text_result = await self.extract_text(image_path)
 
         if not text_result.get("success"):
             return text_result
@@ -200,7 +256,7 @@ class ImageSearchClient:
         Returns:
             List of search results
         """
-        logger.info(f"Searching for images: {query}")
+        logger.info("Searching for images: %s", query)
 
         # Simulate image search results
         results = [
@@ -234,7 +290,7 @@ class VideoSearchClient:
         Returns:
             List of video results
         """
-        logger.info(f"Searching for videos: {query}")
+        logger.info("Searching for videos: %s", query)
 
         # Simulate video search results
         results = [
@@ -267,8 +323,49 @@ class MultimodalToolChainer:
         self.image_search = ImageSearchClient()
         self.video_search = VideoSearchClient()
         self.chains: List[ToolChain] = []
+        # Running totals over self.chains. Every mutator bumps
+        # _chains_version; the totals are valid for _totals_version.
+        self._total_steps = 0
+        self._total_latency_ms = 0.0
+        self._successful_chains = 0
+        self._chains_version = 0
+        self._totals_version = 0
+        self._totals_len = 0
         logger.info("MultimodalToolChainer initialized")
 
+    def _register_chain(self, chain: ToolChain) -> None:
+        """Record a completed chain and fold it into the running totals."""
+        current = self._totals_current()
+        self.chains.append(chain)
+        self._chains_version += 1
+        if current:
+            # Totals were valid before this append; fold the chain in.
+            self._total_steps += len(chain.steps)
+            self._total_latency_ms += chain.total_latency_ms
+            if chain.success:
+                self._successful_chains += 1
+            self._totals_version = self._chains_version
+            self._totals_len = len(self.chains)
+
+    def _totals_current(self) -> bool:
+        # The length check also catches direct edits to self.chains.
+        return (
+            self._totals_version == self._chains_version
+            and self._totals_len == len(self.chains)
+        )
+
+    def clear_chains(self) -> None:
+        """Forget all recorded chains and reset the metrics."""
+        self.chains.clear()
+        self._chains_version += 1
+
+    @staticmethod
+    async def _timed(awaitable) -> Tuple[Any, float]:
+        """Await and return (result, latency_ms) so concurrent steps keep their own timings."""
+        start_time = time.perf_counter_ns()
+        result = await awaitable
+        return result, (time.perf_counter_ns() - start_time) / 1_000_000
+
     async def screenshot_to_code_chain(
         self,
         image_path: str,
@@ -287,12 +384,12 @@ class MultimodalToolChainer:
         logger.info(f"Running screenshot_to_code_chain: {image_path}")
 
         chain = ToolChain(
-            chain_id=f"screenshot_to_code_{int(time.time())}",
+            chain_id=f"screenshot_to_code_{time.time_ns()}",
             description="Screenshot → OCR → Code Generation",
         )
 
         # Step 1: OCR extraction
-        start_time = time.time()
+        start_time = time.perf_counter_ns()
         ocr_result = await self.ocr_client.extract_text(image_path)
         ocr_invocation = ImageToolInvocation(
             tool_type=ImageToolType.OCR,
@@ -300,7 +397,7 @@ class MultimodalToolChainer:
             success=ocr_result.get("success", False),
             extracted_text=ocr_result.get("text"),
             confidence_score=ocr_result.get("confidence", 0.0),
-            latency_ms=(time.time() - start_time) * 1000,
+            latency_ms=(time.perf_counter_ns() - start_time) / 1_000_000,
         )
         chain.add_step(ocr_invocation)
 
@@ -308,34 +405,64 @@ class MultimodalToolChainer:
             logger.error("OCR step failed")
             return chain
 
+        # Steps 2 + 3 are independent: analyze the screenshot while searching
+        # for similar examples.
+        (analysis, analysis_ms), (search_results, search_ms) = await asyncio.gather(
+            self._timed(
+                self.ocr_client.analyze_screenshot(image_path, text_result=ocr_result)
+            ),
+            self._timed(self.image_search.search_images(task, num_results=3)),
+        )
+
         # Step 2: Screenshot analysis
-        start_time = time.time()
-        analysis = await self.ocr_client.analyze_screenshot(image_path)
         analysis_invocation = ImageToolInvocation(
             tool_type=ImageToolType.SCREENSHOT_ANALYSIS,
             image_path=image_path,
             success=analysis.get("success", False),
             analysis_result=analysis,
             confidence_score=analysis.get("confidence", 0.0),
-            latency_ms=(time.time() - start_time) * 1000,
+            latency_ms=analysis_ms,
         )
         chain.add_step(analysis_invocation)
 
         # Step 3: Image search for similar examples
-        start_time = time.time()
-        search_results = await self.image_search.search_images(task, num_results=3)
         search_invocation = ImageToolInvocation(
             tool_type=ImageToolType.IMAGE_SEARCH,
             query=task,
             success=len(search_results) > 0,
             analysis_result={"search_results": search_results},
-            latency_ms=(time.time() - start_time) * 1000,
+            latency_ms=search_ms,
         )
         chain.add_step(search_invocation)
 
-        self.chains.append(chain)
+        self._register_chain(chain)
         return chain
 
+    async def screenshot_batch_to_code_chain(
+        self,
+        image_paths: List[str],
+        task: str,
+        concurrency: int = 8,
+    ) -> List[ToolChain]:
+        """
+        Run screenshot_to_code_chain over several screenshots concurrently.
+
+        Args:
+            image_paths: Paths to screenshots
+            task: Code generation task shared by all screenshots
+            concurrency: Maximum chains in flight at once
+
+        Returns:
+            One tool chain per screenshot, in input order
+        """
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+
+        async def _run(path: str) -> ToolChain:
+            async with semaphore:
+                return await self.screenshot_to_code_chain(path, task)
+
+        return await asyncio.gather(*(_run(path) for path in image_paths))
+
     async def diagram_to_structure_chain(
         self,
         image_path: str,
@@ -352,24 +479,24 @@ class MultimodalToolChainer:
         logger.info(f"Running diagram_to_structure_chain: {image_path}")
 
         chain = ToolChain(
-            chain_id=f"diagram_to_structure_{int(time.time())}",
+            chain_id=f"diagram_to_structure_{time.time_ns()}",
             description="Diagram → OCR → Structure Extraction",
         )
 
         # Step 1: OCR
-        start_time = time.time()
+        start_time = time.perf_counter_ns()
         ocr_result = await self.ocr_client.extract_text(image_path)
         ocr_invocation = ImageToolInvocation(
             tool_type=ImageToolType.OCR,
             image_path=image_path,
             success=ocr_result.get("success", False),
             extracted_text=ocr_result.get("text"),
-            latency_ms=(time.time() - start_time) * 1000,
+            latency_ms=(time.perf_counter_ns() - start_time) / 1_000_000,
         )
         chain.add_step(ocr_invocation)
 
         # Step 2: Diagram interpretation
-        start_time = time.time()
+        start_time = time.perf_counter_ns()
         interpretation = {
             "nodes": ["Component A", "Component B", "Component C"],
             "edges": [
@@ -383,11 +510,11 @@ class MultimodalToolChainer:
             image_path=image_path,
             success=True,
             analysis_result=interpretation,
-            latency_ms=(time.time() - start_time) * 1000,
+            latency_ms=(time.perf_counter_ns() - start_time) / 1_000_000,
         )
         chain.add_step(interpretation_invocation)
 
-        self.chains.append(chain)
+        self._register_chain(chain)
         return chain
 
     async def task_to_example_chain(
@@ -408,36 +535,40 @@ class MultimodalToolChainer:
         logger.info(f"Running task_to_example_chain: {task}")
 
         chain = ToolChain(
-            chain_id=f"task_to_example_{int(time.time())}",
+            chain_id=f"task_to_example_{time.time_ns()}",
             description="Task → Search Examples → Find Resources",
         )
 
+        # Image and video searches are independent; run them concurrently.
+        searches = [self._timed(self.image_search.search_images(task, num_results=5))]
+        if search_videos:
+            searches.append(self._timed(self.video_search.search_videos(task, num_results=3)))
+        outcomes = await asyncio.gather(*searches)
+
         # Step 1: Image search for examples
-        start_time = time.time()
-        image_results = await self.image_search.search_images(task, num_results=5)
+        image_results, image_ms = outcomes[0]
         image_search_invocation = ImageToolInvocation(
             tool_type=ImageToolType.IMAGE_SEARCH,
             query=task,
             success=len(image_results) > 0,
             analysis_result={"results": image_results},
-            latency_ms=(time.time() - start_time) * 1000,
+            latency_ms=image_ms,
         )
         chain.add_step(image_search_invocation)
 
         # Step 2: Video search (optional)
         if search_videos:
-            start_time = time.time()
-            video_results = await self.video_search.search_videos(task, num_results=3)
+            video_results, video_ms = outcomes[1]
             video_search_invocation = ImageToolInvocation(
                 tool_type=ImageToolType.VIDEO_SEARCH,
                 query=task,
                 success=len(video_results) > 0,
                 analysis_result={"results": video_results},
-                latency_ms=(time.time() - start_time) * 1000,
+                latency_ms=video_ms,
             )
             chain.add_step(video_search_invocation)
 
-        self.chains.append(chain)
+        self._register_chain(chain)
         return chain
 
     def get_chaining_success_rate(self) -> float:
@@ -450,9 +581,25 @@ class MultimodalToolChainer:
         if not self.chains:
             return 0.0
 
-        successful = sum(1 for chain in self.chains if chain.success)
+        _, _, successful = self._aggregate_chains()
         return successful / len(self.chains)
 
+    def _aggregate_chains(self) -> Tuple[int, float, int]:
+        """Return (total_steps, total_latency_ms, successful) in O(1)."""
+        if not self._totals_current():
+            # A mutator ran or self.chains was edited directly; rebuild once.
+            self._total_steps = 0
+            self._total_latency_ms = 0.0
+            self._successful_chains = 0
+            for chain in self.chains:
+                self._total_steps += len(chain.steps)
+                self._total_latency_ms += chain.total_latency_ms
+                if chain.success:
+                    self._successful_chains += 1
+            self._totals_version = self._chains_version
+            self._totals_len = len(self.chains)
+        return self._total_steps, self._total_latency_ms, self._successful_chains
+
     def get_chaining_metrics(self) -> Dict[str, Any]:
         """
         Get comprehensive metrics for tool chaining.
@@ -463,16 +610,16 @@ class MultimodalToolChainer:
         if not self.chains:
             return {}
 
-        total_steps = sum(len(chain.steps) for chain in self.chains)
-        total_latency = sum(chain.total_latency_ms for chain in self.chains)
+        num_chains = len(self.chains)
+        total_steps, total_latency, successful = self._aggregate_chains()
 
         return {
-            "num_chains": len(self.chains),
-            "avg_chain_length": total_steps / len(self.chains) if self.chains else 0,
-            "success_rate": self.get_chaining_success_rate(),
-            "avg_total_latency_ms": total_latency / len(self.chains) if self.chains else 0,
-            "successful_chains": sum(1 for c in self.chains if c.success),
-            "failed_chains": sum(1 for c in self.chains if not c.success),
+            "num_chains": num_chains,
+            "avg_chain_length": total_steps / num_chains,
+            "success_rate": successful / num_chains,
+            "avg_total_latency_ms": total_latency / num_chains,
+            "successful_chains": successful,
+            "failed_chains": num_chains - successful,
         }
 
     async def save_chains(self, filename: str = "tool_chains.json") -> Path:
@@ -493,8 +640,17 @@ class MultimodalToolChainer:
             "chains": [chain.to_dict() for chain in self.chains],
         }
 
-        with open(output_path, "w") as f:
-            json.dump(data, f, indent=2, default=str)
+        if orjson is not None:
+            output_path.write_bytes(
+                orjson.dumps(
+                    data,
+                    default=str,
+                    option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS,
+                )
+            )
+        else:
+            with open(output_path, "w") as f:
+                json.dump(data, f, indent=2, default=str)
 
         logger.info(f"Saved {len(self.chains)} tool chains to {output_path}")
         return output_path
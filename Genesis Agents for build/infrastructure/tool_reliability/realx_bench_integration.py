@@ -14,18 +14,27 @@ Integration: DeepEyesV2 Phase 4
 import asyncio
 import json
 import logging
-from dataclasses import dataclass, asdict, field
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Set
+from typing import Dict, List, Optional, Any, Set, Tuple
 from enum import Enum
+import random
 import time
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
 from infrastructure.load_env import load_genesis_env
 
 load_genesis_env()
 
 logger = logging.getLogger(__name__)
 
+# Seed for the simulated evaluations, so runs are reproducible across processes
+_SIMULATION_SEED = 42
+
 
 class TaskType(Enum):
     """RealX-Bench task types"""
@@ -36,7 +45,71 @@ class TaskType(Enum):
     MULTIMODAL_REASONING = "multimodal_reasoning"
 
 
-@dataclass
+# Used by RealXBenchTask.to_dict to skip the Enum.value property per task.
+_TASK_TYPE_VALUE = {member: member.value for member in TaskType}
+
+
+def _json_default(obj: Any) -> Any:
+    """Stdlib fallback for the types orjson handles natively."""
+    if hasattr(obj, "to_dict"):
+        return obj.to_dict()
+    if isinstance(obj, Enum):
+        return obj.value
+    return str(obj)
+
+
+def _write_json(f, obj: Any, depth: int) -> None:
+    """
+    Stream obj to a binary file as 2-space indented JSON.
+
+    Lists and string-keyed dicts are walked so that only one element is
+    encoded at a time; everything else is a single orjson call whose output
+    is re-indented to the current depth (JSON strings never contain a raw
+    newline, so the replace is safe).
+    """
+    indent = b"\n" + b"  " * depth
+    if isinstance(obj, list) and obj:
+        items = ((None, item) for item in obj)
+        open_char, close_char = b"[", b"]"
+    elif isinstance(obj, dict) and obj and all(isinstance(k, str) for k in obj):
+        items = iter(obj.items())
+        open_char, close_char = b"{", b"}"
+    else:
+        encoded = orjson.dumps(
+            obj, default=str, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+        )
+        f.write(encoded.replace(b"\n", indent) if depth else encoded)
+        return
+
+    f.write(open_char)
+    separator = indent + b"  "
+    for key, value in items:
+        f.write(separator)
+        if key is not None:
+            f.write(orjson.dumps(key) + b": ")
+        _write_json(f, value, depth + 1)
+        separator = b"," + indent + b"  "
+    f.write(indent + close_char)
+
+
+def _dump_json(path: Path, obj: Any) -> None:
+    """
+    Write obj to path as indented JSON.
+
+    Tasks and results may be passed as dataclasses; orjson serializes them
+    (and TaskType) directly, and large lists are streamed element by element
+    so the whole document is never held in memory.
+    """
+    if orjson is not None:
+        with open(path, "wb") as f:
+            _write_json(f, obj, 0)
+    else:
+        # json.dump already writes its chunks incrementally
+        with open(path, "w") as f:
+            json.dump(obj, f, indent=2, default=_json_default)
+
+
+@dataclass(slots=True)
 class RealXBenchTask:
     """A single RealX-Bench task"""
     task_id: str
@@ -49,13 +122,20 @@ class RealXBenchTask:
     metadata: Dict[str, Any] = field(default_factory=dict)
 
     def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary"""
-        data = asdict(self)
-        data["task_type"] = self.task_type.value
-        return data
+        """Convert to dictionary (shallow; avoids asdict's deep copy)"""
+        return {
+            "task_id": self.task_id,
+            "task_type": _TASK_TYPE_VALUE[self.task_type],
+            "description": self.description,
+            "required_tools": self.required_tools,
+            "expected_output": self.expected_output,
+            "difficulty": self.difficulty,
+            "timeout_seconds": self.timeout_seconds,
+            "metadata": self.metadata,
+        }
 
 
-@dataclass
+@dataclass(slots=True)
 class TaskResult:
     """Result of executing a task"""
     task_id: str
@@ -69,8 +149,18 @@ class TaskResult:
     quality_score: float = 0.0  # 0-1
 
     def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary"""
-        return asdict(self)
+        """Convert to dictionary (shallow; avoids asdict's deep copy)"""
+        return {
+            "task_id": self.task_id,
+            "agent_name": self.agent_name,
+            "success": self.success,
+            "tool_selected": self.tool_selected,
+            "parameters_correct": self.parameters_correct,
+            "execution_time_ms": self.execution_time_ms,
+            "error_message": self.error_message,
+            "output": self.output,
+            "quality_score": self.quality_score,
+        }
 
 
 class RealXBenchDataset:
@@ -131,16 +221,20 @@ class RealXBenchDataset:
             "git_push",
         ]
 
+        task_types = tuple(TaskType)
+        num_types = len(task_types)
+        num_tools = len(common_tools)
+
         for i in range(num_tasks):
             # Distribute across task types
-            task_type = list(TaskType)[i % len(TaskType)]
+            task_type = task_types[i % num_types]
             difficulty = (i % 5) + 1  # 1-5
 
             task = RealXBenchTask(
                 task_id=f"realx_{i:04d}",
                 task_type=task_type,
                 description=f"Execute {task_type.value} task #{i}",
-                required_tools=[common_tools[i % len(common_tools)]],
+                required_tools=[common_tools[i % num_tools]],
                 expected_output={"status": "success", "result": f"task_{i}_result"},
                 difficulty=difficulty,
                 metadata={
@@ -199,11 +293,10 @@ class RealXBenchDataset:
                 "num_val": len(self.val_tasks),
                 "num_test": len(self.test_tasks),
             },
-            "tasks": [task.to_dict() for task in self.tasks],
+            "tasks": self.tasks,
         }
 
-        with open(output_path, "w") as f:
-            json.dump(data, f, indent=2, default=str)
+        _dump_json(output_path, data)
 
         logger.info(f"Saved RealX-Bench dataset to {output_path}")
         return output_path
@@ -233,6 +326,11 @@ class RealXBenchEvaluator:
         # Evaluate enhanced
         enhanced_results = await evaluator.evaluate_enhanced(dataset.test_tasks)
 
+        # Or run both evaluations concurrently
+        baseline_results, enhanced_results = await evaluator.evaluate_both(
+            dataset.test_tasks
+        )
+
         # Compare
         comparison = evaluator.compare_results(baseline_results, enhanced_results)
     """
@@ -257,6 +355,27 @@ class RealXBenchEvaluator:
 
         logger.info(f"RealXBenchEvaluator initialized: {self.output_dir}")
 
+    @staticmethod
+    def _simulate_outcomes(
+        tasks: List[RealXBenchTask],
+        success_threshold: int,
+        time_base: float,
+        time_mod: int,
+    ) -> Tuple[List[bool], List[float]]:
+        """
+        Simulated success flags and execution times for a task list.
+
+        Pure numeric kernel: one seeded draw per task position feeds both
+        columns, separately from TaskResult construction. The same seed is
+        used for every call, so baseline and enhanced runs over the same task
+        list see the same per-task draw.
+        """
+        draw = random.Random(_SIMULATION_SEED).getrandbits
+        values = [draw(32) for _ in range(len(tasks))]
+        successes = [(v % 10) >= success_threshold for v in values]
+        times = [time_base + (v % time_mod) for v in values]
+        return successes, times
+
     async def evaluate_baseline(
         self,
         tasks: List[RealXBenchTask],
@@ -274,19 +393,19 @@ class RealXBenchEvaluator:
         """
         logger.info(f"Evaluating baseline on {len(tasks)} tasks")
 
-        results = []
-        for task in tasks:
-            # Simulate baseline performance
-            # Baseline: 60-80% success rate
-            success = (hash(task.task_id) % 10) >= 4  # ~60% success
+        # Simulate baseline performance
+        # Baseline: 60-80% success rate (threshold 4 -> ~60% success)
+        successes, times = self._simulate_outcomes(tasks, 4, 50.0, 100)
 
+        results = []
+        for task, success, exec_time in zip(tasks, successes, times):
             result = TaskResult(
                 task_id=task.task_id,
                 agent_name=agent_name,
                 success=success,
                 tool_selected=task.required_tools[0] if task.required_tools else None,
                 parameters_correct=success,
-                execution_time_ms=50.0 + (hash(task.task_id) % 100),
+                execution_time_ms=exec_time,
                 quality_score=0.7 if success else 0.3,
             )
 
@@ -316,19 +435,19 @@ class RealXBenchEvaluator:
         """
         logger.info(f"Evaluating enhanced on {len(tasks)} tasks")
 
-        results = []
-        for task in tasks:
-            # Simulate enhanced performance
-            # Enhanced: 95%+ success rate
-            success = (hash(task.task_id) % 10) >= 1  # ~90% success
+        # Simulate enhanced performance
+        # Enhanced: 95%+ success rate (threshold 1 -> ~90% success)
+        successes, times = self._simulate_outcomes(tasks, 1, 40.0, 80)
 
+        results = []
+        for task, success, exec_time in zip(tasks, successes, times):
             result = TaskResult(
                 task_id=task.task_id,
                 agent_name=agent_name,
                 success=success,
                 tool_selected=task.required_tools[0] if task.required_tools else None,
                 parameters_correct=success,
-                execution_time_ms=40.0 + (hash(task.task_id) % 80),
+                execution_time_ms=exec_time,
                 quality_score=0.95 if success else 0.5,
             )
 
@@ -341,6 +460,44 @@ class RealXBenchEvaluator:
         logger.info(f"Enhanced evaluation complete: {len(results)} results")
         return results
 
+    async def evaluate_both(
+        self,
+        tasks: List[RealXBenchTask],
+        baseline_agent: str = "baseline_agent",
+        enhanced_agent: str = "enhanced_agent",
+    ) -> Tuple[List[TaskResult], List[TaskResult]]:
+        """
+        Evaluate baseline and enhanced agents concurrently.
+
+        Both evaluations are independent, so once they call real agents their
+        I/O overlaps instead of running back to back.
+
+        Args:
+            tasks: Tasks to evaluate
+            baseline_agent: Name of baseline agent
+            enhanced_agent: Name of enhanced agent
+
+        Returns:
+            Tuple of (baseline results, enhanced results)
+        """
+        baseline_results, enhanced_results = await asyncio.gather(
+            self.evaluate_baseline(tasks, agent_name=baseline_agent),
+            self.evaluate_enhanced(tasks, agent_name=enhanced_agent),
+        )
+        return baseline_results, enhanced_results
+
+    @staticmethod
+    def _aggregate_results(results: List[TaskResult]) -> Tuple[int, float, float]:
+        """Return (success count, quality sum, execution time sum) in one pass"""
+        successes = 0
+        quality_sum = 0.0
+        time_sum = 0.0
+        for r in results:
+            successes += r.success
+            quality_sum += r.quality_score
+            time_sum += r.execution_time_ms
+        return successes, quality_sum, time_sum
+
     def compare_results(
         self,
         baseline_results: List[TaskResult],
@@ -356,38 +513,24 @@ class RealXBenchEvaluator:
         Returns:
             Comparison report
         """
-        # Calculate metrics
-        baseline_successes = sum(1 for r in baseline_results if r.success)
-        enhanced_successes = sum(1 for r in enhanced_results if r.success)
-
-        baseline_success_rate = (
-            baseline_successes / len(baseline_results) if baseline_results else 0.0
+        # Calculate metrics (one pass over each result list)
+        baseline_n = len(baseline_results)
+        enhanced_n = len(enhanced_results)
+        baseline_successes, baseline_quality, baseline_time = self._aggregate_results(
+            baseline_results
         )
-        enhanced_success_rate = (
-            enhanced_successes / len(enhanced_results) if enhanced_results else 0.0
+        enhanced_successes, enhanced_quality, enhanced_time = self._aggregate_results(
+            enhanced_results
         )
 
-        baseline_avg_quality = (
-            sum(r.quality_score for r in baseline_results) / len(baseline_results)
-            if baseline_results
-            else 0.0
-        )
-        enhanced_avg_quality = (
-            sum(r.quality_score for r in enhanced_results) / len(enhanced_results)
-            if enhanced_results
-            else 0.0
-        )
+        baseline_success_rate = baseline_successes / baseline_n if baseline_n else 0.0
+        enhanced_success_rate = enhanced_successes / enhanced_n if enhanced_n else 0.0
 
-        baseline_avg_time = (
-            sum(r.execution_time_ms for r in baseline_results) / len(baseline_results)
-            if baseline_results
-            else 0.0
-        )
-        enhanced_avg_time = (
-            sum(r.execution_time_ms for r in enhanced_results) / len(enhanced_results)
-            if enhanced_results
-            else 0.0
-        )
+        baseline_avg_quality = baseline_quality / baseline_n if baseline_n else 0.0
+        enhanced_avg_quality = enhanced_quality / enhanced_n if enhanced_n else 0.0
+
+        baseline_avg_time = baseline_time / baseline_n if baseline_n else 0.0
+        enhanced_avg_time = enhanced_time / enhanced_n if enhanced_n else 0.0
 
         # Calculate improvements
         success_improvement = (
@@ -446,17 +589,16 @@ class RealXBenchEvaluator:
         results = {
             "timestamp": time.time(),
             "baseline": {
-                "results": [r.to_dict() for r in baseline_results],
+                "results": baseline_results,
             },
             "enhanced": {
-                "results": [r.to_dict() for r in enhanced_results],
+                "results": enhanced_results,
             },
             "comparison": comparison,
         }
 
         output_path = self.output_dir / "realx_bench_results.json"
-        with open(output_path, "w") as f:
-            json.dump(results, f, indent=2, default=str)
+        _dump_json(output_path, results)
 
         logger.info(f"Saved RealX-Bench results to {output_path}")
         return output_path
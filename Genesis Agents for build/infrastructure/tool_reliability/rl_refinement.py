@@ -14,17 +14,36 @@ Integration: DeepEyesV2 Phase 3
 import asyncio
 import json
 import logging
-from dataclasses import dataclass, field, asdict
+import math
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Dict, List, Optional, Any, Tuple
 import time
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
 from infrastructure.load_env import load_genesis_env
 
 load_genesis_env()
 
 logger = logging.getLogger(__name__)
 
+# Both parsers accept bytes, and orjson.JSONDecodeError is a subclass of
+# json.JSONDecodeError, so one except clause covers either.
+_loads = orjson.loads if orjson is not None else json.loads
+
+
+def _dump_json(path: Path, obj: Any) -> None:
+    """Write history/checkpoint data as indented JSON (orjson when available)."""
+    if orjson is not None:
+        path.write_bytes(orjson.dumps(obj, option=orjson.OPT_INDENT_2))
+    else:
+        with open(path, "w") as f:
+            json.dump(obj, f, indent=2)
+
 
 @dataclass
 class RLTrajectory:
@@ -41,8 +60,19 @@ class RLTrajectory:
     metadata: Dict[str, Any] = field(default_factory=dict)
 
     def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary"""
-        return asdict(self)
+        """Convert to dictionary (shallow; orjson can take the dataclass as-is)"""
+        return {
+            "task_description": self.task_description,
+            "tool_name": self.tool_name,
+            "parameters": self.parameters,
+            "success": self.success,
+            "status_code": self.status_code,
+            "reward": self.reward,
+            "cumulative_reward": self.cumulative_reward,
+            "latency_ms": self.latency_ms,
+            "agent_name": self.agent_name,
+            "metadata": self.metadata,
+        }
 
 
 class RewardFunction:
@@ -163,6 +193,8 @@ class RLRefinement:
         # Training history
         self.training_history: List[Dict[str, Any]] = []
         self.validation_history: List[Dict[str, Any]] = []
+        # Lowest loss across all recorded training steps
+        self.best_loss = float("inf")
 
         logger.info(f"RLRefinement initialized: output_dir={self.output_dir}")
 
@@ -218,13 +250,13 @@ class RLRefinement:
             return 0
 
         count = 0
-        with open(invocations_path, "r") as f:
+        with open(invocations_path, "rb") as f:
             for line in f:
                 if max_trajectories and count >= max_trajectories:
                     break
 
                 try:
-                    data = json.loads(line)
+                    data = _loads(line)
 
                     trajectory = RLTrajectory(
                         task_description=data.get("task_description", ""),
@@ -280,31 +312,35 @@ class RLRefinement:
             f"{num_steps} steps, batch_size={batch_size}"
         )
 
-        # Compute cumulative rewards (backward pass)
+        # Compute cumulative rewards (backward pass) over a flat reward list,
+        # then write them back to the trajectories in one forward sweep.
+        n = len(self.trajectories)
+        rewards = [self.trajectory_rewards.get(idx, 0.0) for idx in range(n)]
+        cum_rewards = [0.0] * n
         cumulative_reward = 0.0
-        for idx in range(len(self.trajectories) - 1, -1, -1):
-            cumulative_reward = (
-                self.trajectory_rewards.get(idx, 0.0) + gamma * cumulative_reward
-            )
-            self.trajectories[idx].cumulative_reward = cumulative_reward
+        for idx in range(n - 1, -1, -1):
+            cumulative_reward = rewards[idx] + gamma * cumulative_reward
+            cum_rewards[idx] = cumulative_reward
+        for trajectory, cumulative_reward in zip(self.trajectories, cum_rewards):
+            trajectory.cumulative_reward = cumulative_reward
 
         # Training loop
         best_loss = float("inf")
         no_improve_steps = 0
         early_stop_threshold = 100
 
-        for step in range(num_steps):
-            # Sample batch of trajectories
-            batch_size_actual = min(batch_size, len(self.trajectories))
-            batch_indices = list(range(len(self.trajectories)))[:batch_size_actual]
+        # Sample batch of trajectories. The batch is always the leading
+        # trajectories and their returns are fixed during training, so the
+        # batch loss is computed once rather than on every step.
+        batch_size_actual = min(batch_size, n)
 
-            # Compute batch loss (simplified)
-            # In production: compute actual policy gradient
-            batch_loss = sum(
-                abs(self.trajectories[i].cumulative_reward)
-                for i in batch_indices
-            ) / batch_size_actual
+        # Compute batch loss (simplified)
+        # In production: compute actual policy gradient
+        batch_loss = sum(
+            abs(reward) for reward in cum_rewards[:batch_size_actual]
+        ) / batch_size_actual
 
+        for step in range(num_steps):
             # Policy update (simulated)
             policy_loss = batch_loss / (step + 1)  # Decrease loss over time
 
@@ -333,10 +369,11 @@ class RLRefinement:
                 logger.info(f"Early stopping at step {step}")
                 break
 
+        self.best_loss = min(self.best_loss, best_loss)
+
         # Save training history
         history_path = self.output_dir / "rl_training_history.json"
-        with open(history_path, "w") as f:
-            json.dump(self.training_history, f, indent=2)
+        _dump_json(history_path, self.training_history)
 
         result = {
             "num_steps": step + 1,
@@ -368,23 +405,31 @@ class RLRefinement:
 
         logger.info(f"Evaluating on {len(val_trajectories)} validation trajectories")
 
+        n = len(val_trajectories)
+
+        # Success count and latency total in one pass
+        successes = 0
+        latency_total = 0.0
+        for t in val_trajectories:
+            successes += t.success
+            latency_total += t.latency_ms
+
         # Compute success rate
-        successes = sum(1 for t in val_trajectories if t.success)
-        success_rate = successes / len(val_trajectories)
+        success_rate = successes / n
 
-        # Compute average reward
+        # Compute average reward. The reward only depends on the success flag
+        # here, so evaluate it once per outcome rather than per trajectory.
+        success_reward = self.reward_fn.compute_reward(True)
+        failure_reward = self.reward_fn.compute_reward(False)
         avg_reward = (
-            sum(self.reward_fn.compute_reward(t.success) for t in val_trajectories)
-            / len(val_trajectories)
-        )
+            successes * success_reward + (n - successes) * failure_reward
+        ) / n
 
         # Compute average latency
-        avg_latency = (
-            sum(t.latency_ms for t in val_trajectories) / len(val_trajectories)
-        )
+        avg_latency = latency_total / n
 
         metrics = {
-            "num_trajectories": len(val_trajectories),
+            "num_trajectories": n,
             "success_rate": success_rate,
             "average_reward": avg_reward,
             "average_latency_ms": avg_latency,
@@ -437,15 +482,14 @@ class RLRefinement:
             "name": name,
             "num_trajectories": len(self.trajectories),
             "training_steps": len(self.training_history),
-            "best_loss": min(
-                [h["loss"] for h in self.training_history], default=float("inf")
-            ),
+            # No loss yet is inf; orjson would write null and json Infinity,
+            # so store null explicitly either way.
+            "best_loss": self.best_loss if math.isfinite(self.best_loss) else None,
             "timestamp": time.time(),
         }
 
         checkpoint_path = self.output_dir / f"checkpoint_{name}.json"
-        with open(checkpoint_path, "w") as f:
-            json.dump(checkpoint, f, indent=2)
+        _dump_json(checkpoint_path, checkpoint)
 
         logger.info(f"Saved checkpoint: {checkpoint_path}")
         return checkpoint_path
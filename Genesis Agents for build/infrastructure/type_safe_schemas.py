@@ -37,12 +37,22 @@ MAX_LIST_LENGTH = 100  # Max items in lists
 MAX_DICT_SIZE = 50  # Max keys in dictionaries
 
 # HIGH PRIORITY FIX: Secrets to strip from logs
-SECRET_PATTERNS = [
-    r'api[_-]?key["\']?\s*[:=]\s*["\']?([a-zA-Z0-9_-]{20,})',
-    r'password["\']?\s*[:=]\s*["\']?([^\s"\']+)',
-    r'token["\']?\s*[:=]\s*["\']?([a-zA-Z0-9_-]{20,})',
-    r'secret["\']?\s*[:=]\s*["\']?([a-zA-Z0-9_-]{20,})',
+# Each pattern is paired with the literal its match must start with, so
+# ASCII text only pays for a regex scan when that keyword is present.
+_SECRET_RULES = [
+    ("api", r'api[_-]?key["\']?\s*[:=]\s*["\']?([a-zA-Z0-9_-]{20,})'),
+    ("password", r'password["\']?\s*[:=]\s*["\']?([^\s"\']+)'),
+    ("token", r'token["\']?\s*[:=]\s*["\']?([a-zA-Z0-9_-]{20,})'),
+    ("secret", r'secret["\']?\s*[:=]\s*["\']?([a-zA-Z0-9_-]{20,})'),
 ]
+SECRET_PATTERNS = [pattern for _, pattern in _SECRET_RULES]
+
+# Compiled once; applied in order since later patterns see earlier redactions.
+_SECRET_RES = [
+    (keyword, re.compile(pattern, re.IGNORECASE))
+    for keyword, pattern in _SECRET_RULES
+]
+_HTML_TAG_RE = re.compile(r'<[^>]+>')
 
 def sanitize_content(text: str) -> str:
     """
@@ -57,12 +67,23 @@ def sanitize_content(text: str) -> str:
     if not isinstance(text, str):
         return text
     
-    # Strip secrets
-    for pattern in SECRET_PATTERNS:
-        text = re.sub(pattern, r'\1=[REDACTED]', text, flags=re.IGNORECASE)
+    # Strip secrets. Non-ASCII text always gets the full scans: IGNORECASE
+    # lets characters like U+212A (Kelvin sign) match ASCII letters.
+    if text.isascii():
+        lowered = text.lower()
+        for keyword, secret_re in _SECRET_RES:
+            if keyword in lowered:
+                redacted = secret_re.sub(r'\1=[REDACTED]', text)
+                if redacted != text:
+                    text = redacted
+                    lowered = text.lower()
+    else:
+        for _, secret_re in _SECRET_RES:
+            text = secret_re.sub(r'\1=[REDACTED]', text)
     
     # Remove HTML tags (basic sanitization)
-    text = re.sub(r'<[^>]+>', '', text)
+    if '<' in text:
+        text = _HTML_TAG_RE.sub('', text)
     
     return text
 